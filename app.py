@@ -4,14 +4,11 @@ import openai  # Ensure OpenAI is imported correctly
 from streamlit.logger import get_logger
 from utils import summary_generator
 from utils.helper import check_availability
+from utils import yahoo_auth
+from utils.yahoo_auth import TOKEN_STORE
+from utils.stream_renderer import StreamRenderer
 import traceback
 import requests
-import json
-import tempfile
-from requests.auth import HTTPBasicAuth
-import time
-import os
-import shutil
 
 LOGGER = get_logger(__name__)
 
@@ -76,90 +73,57 @@ def main():
                 redirect_uri = "oob" #"oob"  # Out of band # "https://yahoo-ff-test.streamlit.app/" for dev version
                 auth_page = f'https://api.login.yahoo.com/oauth2/request_auth?client_id={cid}&redirect_uri={redirect_uri}&response_type=code'
 
-                # Show ST Button to open Yahoo OAuth2 Page
+                # Returning users are recognised by an opaque key kept in the URL; their
+                # tokens live server-side in the token store and are refreshed as needed.
+                # The key signs in whoever has the link, until the sign-in expires
+                if 'yahoo_user_key' not in st.session_state:
+                    st.session_state['yahoo_user_key'] = st.query_params.get('yahoo_session', '')
+
                 if 'auth_code' not in st.session_state:
                     st.session_state['auth_code'] = ''
 
-                if 'access_token' not in st.session_state:
-                    st.session_state['access_token'] = ''
-
-                if 'refresh_token' not in st.session_state:
-                    st.session_state['refresh_token'] = ''
-                
-                temp_dir = None
-
-                st.write("1. Click the link below to authenticate with Yahoo and get the authorization code.")
-                st.write(f"[Authenticate with Yahoo]({auth_page})")
-
-                # Get Auth Code pasted by user
-                st.write("2. Paste the authorization code here:")
-                auth_code = st.text_input("Authorization Code")
-
-                if auth_code:
-                    st.session_state['auth_code'] = auth_code
-                    st.success('Authorization code received!')
-                    #st.write(f'Your authorization code is: {auth_code}')
-
-                # Get the token
-                if st.session_state['auth_code'] and not st.session_state['access_token']:
-                    basic = HTTPBasicAuth(cid, cse)
-                    _data = {
-                        'redirect_uri': redirect_uri,
-                        'code': st.session_state['auth_code'],
-                        'grant_type': 'authorization_code'
-                    }
+                # Refreshes an expired access token; a rejected refresh token signs the user out
+                try:
+                    signed_in = TOKEN_STORE.auth_dir(st.session_state['yahoo_user_key'], cid, cse) is not None
+                except Exception as err:
+                    # Yahoo is down or timed out; the stored token is kept for the next try
+                    LOGGER.exception(err)
+                    st.error(f"Could not reach Yahoo to refresh your sign-in, please try again in a few minutes. ({err})")
+                    signed_in = None
+                if signed_in:
+                    st.success('Signed in with Yahoo!')
+                elif signed_in is not None:
+                    st.write("1. Click the link below to authenticate with Yahoo and get the authorization code.")
+                    st.write(f"[Authenticate with Yahoo]({auth_page})")
 
-                    try:
-                        r = requests.post('https://api.login.yahoo.com/oauth2/get_token', data=_data, auth=basic)
-                        r.raise_for_status()  # Will raise an exception for HTTP errors
-                        token_data = r.json()
-                        st.session_state['access_token'] = token_data.get('access_token', '')
-                        st.session_state['refresh_token'] = token_data.get('refresh_token', '')
-                        st.session_state['token_time'] = time.time()
-                        st.success('Access token received!')
-                    except requests.exceptions.HTTPError as err:
-                        st.error(f"HTTP error occurred: {err}")
-                    except Exception as err:
-                        st.error(f"An error occurred: {err}")
+                    # Get Auth Code pasted by user
+                    st.write("2. Paste the authorization code here:")
+                    auth_code = st.text_input("Authorization Code")
 
-                # Use the access token
-                if st.session_state['access_token']:
-                    #st.write("Now you can use the access token to interact with Yahoo's API.")
+                    if auth_code:
+                        st.session_state['auth_code'] = auth_code
+                        st.success('Authorization code received!')
 
-                    # Allow user to input league ID
-                    # league_id = st.text_input("Enter your Yahoo Fantasy Sports league ID:")
-                    temp_dir = tempfile.mkdtemp()
-                    if league_id:
-                        # Define the paths to the token and private files
-                        token_file_path = os.path.join(temp_dir, "token.json")
-                        private_file_path = os.path.join(temp_dir, "private.json")
-
-                        # Create the token file with all necessary details
-                        token_data = {
-                            "access_token": st.session_state['access_token'],
-                            "consumer_key": cid,
-                            "consumer_secret": cse,
-                            "guid": None,
-                            "refresh_token": st.session_state['refresh_token'],
-                            "expires_in": 3600, 
-                            "token_time": st.session_state['token_time'],
-                            "token_type": "bearer"
-                            }
-                        with open(token_file_path, 'w') as f:
-                            json.dump(token_data, f)
-
-                        # Create the private file with consumer key and secret
-                        private_data = {
-                            "consumer_key": cid,
-                            "consumer_secret": cse,
-                        }
-                        with open(private_file_path, 'w') as f:
-                            json.dump(private_data, f)
+                    # Get the token
+                    if st.session_state['auth_code']:
+                        try:
+                            token_data = yahoo_auth.exchange_code(cid, cse, st.session_state['auth_code'], redirect_uri)
+                            user_key = TOKEN_STORE.create(token_data, cid, cse)
+                            st.session_state['yahoo_user_key'] = user_key
+                            st.query_params['yahoo_session'] = user_key
+                            st.session_state['auth_code'] = ''
+                            st.success('Access token received!')
+                        except requests.exceptions.HTTPError as err:
+                            st.error(f"HTTP error occurred: {err}")
+                        except Exception as err:
+                            st.error(f"An error occurred: {err}")
             elif league_type == "Sleeper":
                 st.text_input("LeagueID", key='LeagueID')
             
             st.text_input("Character Description", key='Character Description', placeholder="Dwight Schrute", help= "Describe a persona for the AI to adopt. E.g. 'Dwight Schrute' or 'A very drunk Captain Jack Sparrow'")
             st.slider("Trash Talk Level", 1, 10, key='Trash Talk Level', value=5, help="Scale of 1 to 10, where 1 is friendly banter and 10 is more extreme trash talk")
+            st.text_area("More Characters (optional)", key='More Characters', placeholder="Michael Scott\nA pirate captain", help="One character per line. Each one gets its own recap, generated at the same time.")
+            st.checkbox("Season in Review", key='Season Review', help="Recap every completed week of the season instead of only the most recent one.")
             submit_button = st.form_submit_button(label='🤖 Generate AI Summary')
 
     
@@ -187,6 +151,7 @@ def main():
                 trash_talk_level = st.session_state.get('Trash Talk Level', 'Not provided')
                 swid = st.session_state.get('SWID', 'Not provided')
                 espn2 = st.session_state.get('ESPN2_Id', 'Not provided')
+                season_review = st.session_state.get('Season Review', False)
                 
                 LOGGER.debug("Retrieving OpenAI Keys")
 
@@ -208,43 +173,79 @@ def main():
                 progress.progress(30)
                 if league_type == "ESPN":
                     LOGGER.debug("Attempting ESPN summary generator...")
-                    summary, debug_info = summary_generator.get_espn_league_summary(
-                        league_id, espn2, swid 
-                    )
+                    if season_review:
+                        summary, debug_info = summary_generator.get_espn_season_summary(league_id, espn2, swid)
+                    else:
+                        summary, debug_info = summary_generator.get_espn_league_summary(
+                            league_id, espn2, swid 
+                        )
                     LOGGER.debug("~~ESPN DEBUG BELOW~~")
                     LOGGER.debug(debug_info)
                     LOGGER.debug("~~ESPN SUMMARY BELOW~~")
                     LOGGER.debug(summary)
                 elif league_type == "Yahoo":
-                    summary = summary_generator.get_yahoo_league_summary(league_id, temp_dir)
+                    auth_dir = TOKEN_STORE.auth_dir(
+                        st.session_state.get('yahoo_user_key', ''), st.secrets["YAHOO_CLIENT_ID"], st.secrets["YAHOO_CLIENT_SECRET"]
+                    )
+                    if auth_dir is None:
+                        st.error("Please authenticate with Yahoo first. If you were signed in, your Yahoo session has expired.")
+                        return
+                    if season_review:
+                        summary = summary_generator.get_yahoo_season_summary(league_id, auth_dir)
+                    else:
+                        summary = summary_generator.get_yahoo_league_summary(league_id, auth_dir)
                     LOGGER.debug(summary)
-                    st.write("Completed summary query, cleaning up...")
-                    shutil.rmtree(temp_dir)
-                    st.write("Done with cleanup! Creating AI summary now...")
                 elif league_type == "Sleeper":
                     auth_directory = "auth"
-                    summary = summary_generator.generate_sleeper_summary(
-                        league_id  
-                    )
+                    if season_review:
+                        summary = summary_generator.generate_sleeper_season_summary(league_id)
+                    else:
+                        summary = summary_generator.generate_sleeper_summary(
+                            league_id  
+                        )
                     LOGGER.debug(summary)
                 
                 progress.text('Generating AI summary...')
                 progress.progress(50)
 
+                more_characters = [c.strip() for c in st.session_state.get('More Characters', '').splitlines() if c.strip()]
+                if more_characters:
+                    # Several personas: generate concurrently and show each in its own tab
+                    personas = [(character, trash_talk_level) for character in [character_description] + more_characters]
+                    LOGGER.debug(f"Initializing {len(personas)} concurrent GPT Summary Streams...")
+                    with st.chat_message("Commish", avatar="🤖"):
+                        tabs = st.tabs([character for character, _ in personas])
+                        renderers = []
+                        for tab in tabs:
+                            with tab:
+                                renderers.append(StreamRenderer(st.empty()))
+                        progress.progress(70)
+                        for index, chunk in summary_generator.generate_multi_persona_summaries_streaming(summary, personas, season_review=season_review):
+                            renderers[index].append(chunk)
+                        for tab, renderer in zip(tabs, renderers):
+                            response = renderer.finish()
+                            LOGGER.debug(f"Stream render stats: {renderer.stats()}")
+                            with tab:
+                                st.code(response, language="")
+                        st.markdown("**Click the copy icon** 📋 in the top right corner of a recap to copy it and paste it wherever you see fit!")
+                    LOGGER.debug("GPT Streams done!")
+                    progress.text('Done!')
+                    progress.progress(100)
+                    return
+
                 LOGGER.debug("Initializing GPT Summary Stream...")
                 gpt4_summary_stream = summary_generator.generate_gpt4_summary_streaming(
-                    summary, character_description, trash_talk_level
+                    summary, character_description, trash_talk_level, season_review=season_review
                 )
                 LOGGER.debug(f"Generator object: {gpt4_summary_stream}")
                 LOGGER.debug("Recieved GPT Summary. Attempting GPT Stream...")
                 with st.chat_message("Commish", avatar="🤖"):
-                    message_placeholder = st.empty()
-                    full_response = ""
+                    renderer = StreamRenderer(st.empty())
                     progress.progress(70)
                     for chunk in gpt4_summary_stream:
-                        full_response += chunk
-                        message_placeholder.markdown(full_response + "▌")
-                    message_placeholder.markdown(full_response)
+                        renderer.append(chunk)
+                    full_response = renderer.finish()
+                    LOGGER.debug(f"Stream render stats: {renderer.stats()}")
                     
                     # Display the full response within a code block which provides a copy button
                     st.markdown("**Click the copy icon** 📋 below in top right corner to copy your summary and paste it wherever you see fit!")
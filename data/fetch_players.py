@@ -1,7 +1,13 @@
 # fetch_players.py
+import os
+import sys
 from sleeper_wrapper import Players
 import json
 
+# Allow running as `python data/fetch_players.py` from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.player_store import build_player_store, write_slim_players
+
 def save_players_data():
     players = Players()
     all_players = players.get_all_players()
@@ -9,5 +15,10 @@ def save_players_data():
     with open('players_data.json', 'w') as f:
         json.dump(all_players, f)
 
+    # Compact, versioned artifact (player_id -> name, position, team) loaded at runtime
+    manifest = write_slim_players(all_players, 'players_slim.json.gz')
+    # Indexed copy used at runtime to resolve player names without the full dump
+    build_player_store(all_players, 'players.sqlite', manifest['content_hash'])
+
 if __name__ == "__main__":
     save_players_data()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The app runs from the repository root (`streamlit run app.py`), so tests import
+# `utils` from there too
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from utils import summary_generator
+from utils.llm_metrics import LLM_METRICS
+from utils.llm_stream import stream_completion
+from utils.recap_cache import RecapCache
+
+MESSAGES = [{"role": "user", "content": "Recap the week"}]
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local OpenAI-compatible chat completions server that streams `chunks` for every
+    model, after `first_token_delay[model]` seconds, or fails models in `failing`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, first_token_delay=None, failing=(), chunks=("Hello ", "league", "!")):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.first_token_delay = first_token_delay or {}
+        self.failing = set(failing)
+        self.chunks = chunks
+        self.requests = []
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _event(self, data):
+        self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = body["model"]
+        self.server.requests.append(model)
+        if model in self.server.failing:
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": {"message": "stand-in failure", "type": "server_error"}}).encode("utf-8"))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        chunk = {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": model}
+        try:
+            time.sleep(self.server.first_token_delay.get(model, 0))
+            for content in self.server.chunks:
+                self._event(json.dumps(dict(chunk, choices=[{"index": 0, "delta": {"content": content}, "finish_reason": None}])))
+            usage = {"prompt_tokens": 5, "completion_tokens": len(self.server.chunks), "total_tokens": 5 + len(self.server.chunks)}
+            self._event(json.dumps(dict(chunk, choices=[], usage=usage)))
+            self._event("[DONE]")
+        except (BrokenPipeError, ConnectionResetError):
+            # The losing request of a hedge is cancelled mid-stream
+            pass
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(**kwargs):
+        stand_in = StandInServer(**kwargs)
+        threading.Thread(target=stand_in.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(stand_in)
+        return stand_in, openai.OpenAI(base_url=stand_in.base_url, api_key="test", max_retries=0)
+
+    yield start
+    for stand_in in servers:
+        stand_in.shutdown()
+        stand_in.server_close()
+
+
+def test_streams_without_hedging(server):
+    stand_in, client = server()
+    chunks = list(stream_completion(client, MESSAGES, "primary"))
+    assert chunks == [("primary", "Hello "), ("primary", "league"), ("primary", "!")]
+    assert stand_in.requests == ["primary"]
+
+
+def test_fast_primary_is_not_hedged(server):
+    stand_in, client = server()
+    chunks = list(stream_completion(client, MESSAGES, "primary", hedge_after=1.0, fallback_model="fallback"))
+    assert {model for model, _ in chunks} == {"primary"}
+    assert stand_in.requests == ["primary"]
+
+
+def test_slow_first_token_is_hedged(server):
+    stand_in, client = server(first_token_delay={"primary": 3.0})
+    start = time.perf_counter()
+    chunks = list(stream_completion(client, MESSAGES, "primary", hedge_after=0.2, fallback_model="fallback"))
+    elapsed = time.perf_counter() - start
+    assert chunks == [("fallback", "Hello "), ("fallback", "league"), ("fallback", "!")]
+    assert stand_in.requests == ["primary", "fallback"]
+    assert elapsed < 2.0
+
+    # The backup's time to first token is what the user waited, hedge delay included
+    backup = [record for record in json.loads(LLM_METRICS.to_json())["records"] if record["model"] == "fallback"][-1]
+    assert backup["hedge_delay_seconds"] >= 0.2
+    assert backup["ttft_seconds"] >= backup["hedge_delay_seconds"]
+    assert backup["completion_tokens"] == 3
+
+
+def test_failed_primary_is_hedged_before_the_deadline(server):
+    stand_in, client = server(failing={"primary"})
+    start = time.perf_counter()
+    chunks = list(stream_completion(client, MESSAGES, "primary", hedge_after=5.0, fallback_model="fallback"))
+    assert [model for model, _ in chunks] == ["fallback"] * 3
+    assert time.perf_counter() - start < 2.0
+
+
+def test_every_attempt_failing_raises(server):
+    _, client = server(failing={"primary", "fallback"})
+    with pytest.raises(openai.APIError):
+        list(stream_completion(client, MESSAGES, "primary", hedge_after=0.2, fallback_model="fallback"))
+
+
+def test_recap_won_by_the_fallback_is_replayed(server, tmp_path, monkeypatch):
+    stand_in, client = server(first_token_delay={"primary": 3.0})
+    recap_cache = RecapCache(str(tmp_path / "recaps.sqlite"))
+    monkeypatch.setattr(summary_generator, "get_recap_cache", lambda: recap_cache)
+
+    def recap():
+        return "".join(summary_generator.generate_gpt4_summary_streaming(
+            "summary", "Dwight Schrute", 5, model="primary", hedge_after=0.2, fallback_model="fallback", client=client,
+        ))
+
+    assert recap() == "Hello league!"
+    assert recap() == "Hello league!"
+    assert stand_in.requests == ["primary", "fallback"]
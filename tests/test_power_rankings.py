@@ -0,0 +1,104 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.power_rankings import all_play_wins, power_rankings, week_scores_from_league_week
+from utils.season_stats import SeasonAccumulator
+from utils.week_model import LeagueWeek, TeamWeek
+
+
+def pairwise_all_play_wins(scores):
+    # Every team against every other team, ties counting half
+    return [
+        sum(1.0 if score > other else 0.5 if score == other else 0.0 for j, other in enumerate(scores) if j != i)
+        for i, score in enumerate(scores)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_all_play_wins_matches_pairwise_reference(seed):
+    rng = random.Random(seed)
+    # Few distinct values so most weeks have ties, some several deep
+    scores = [float(rng.randint(0, rng.choice([3, 10, 100]))) for _ in range(rng.randint(1, 32))]
+    assert all_play_wins(np.array(scores)).tolist() == pairwise_all_play_wins(scores)
+
+
+def random_season(rng, n_teams, n_weeks):
+    weeks = []
+    for week in range(1, n_weeks + 1):
+        order = list(range(n_teams))
+        rng.shuffle(order)
+        teams = [
+            # An odd team out has a bye
+            TeamWeek(team_id, f"Team {team_id}", float(rng.randint(80, 90)), None,
+                     position // 2 if position < n_teams - n_teams % 2 else None, [])
+            for position, team_id in enumerate(order)
+        ]
+        weeks.append(LeagueWeek("espn", 1, week, teams))
+    return weeks
+
+
+def pairwise_power_rankings(weeks):
+    # Team id -> [all-play wins, all-play games, actual wins, expected wins]
+    totals = {}
+    for league_week in weeks:
+        teams = [team for team in league_week.teams if team.points is not None]
+        wins = pairwise_all_play_wins([team.points for team in teams])
+        rates = {}
+        for team, team_wins in zip(teams, wins):
+            row = totals.setdefault(team.team_id, [0.0, 0, 0.0, 0.0])
+            row[0] += team_wins
+            row[1] += len(teams) - 1
+            rates[team.team_id] = team_wins / (len(teams) - 1)
+        for first, second in league_week.matchups():
+            for team, opponent in ((first, second), (second, first)):
+                row = totals[team.team_id]
+                row[2] += 1.0 if team.points > opponent.points else 0.5 if team.points == opponent.points else 0.0
+                row[3] += rates[team.team_id]
+    return totals
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_power_rankings_match_pairwise_reference(seed):
+    rng = random.Random(seed)
+    weeks = random_season(rng, rng.randint(2, 13), rng.randint(1, 6))
+    expected = pairwise_power_rankings(weeks)
+    rows = power_rankings([week_scores_from_league_week(league_week) for league_week in weeks])
+
+    assert sorted(row["team_id"] for row in rows) == sorted(expected)
+    for row in rows:
+        all_play, games, wins, expected_wins = expected[row["team_id"]]
+        assert row["all_play_wins"] == pytest.approx(all_play)
+        assert row["all_play_losses"] == pytest.approx(games - all_play)
+        assert row["wins"] == pytest.approx(wins)
+        assert row["expected_wins"] == pytest.approx(expected_wins)
+        assert row["luck"] == pytest.approx(wins - expected_wins)
+    rates = [row["all_play_wins"] / (row["all_play_wins"] + row["all_play_losses"]) for row in rows]
+    assert rates == sorted(rates, reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_season_luck_matches_power_rankings(seed):
+    rng = random.Random(seed)
+    weeks = random_season(rng, rng.randint(2, 13), rng.randint(1, 6))
+    season = SeasonAccumulator("espn", 1)
+    for league_week in weeks:
+        season.apply_week(league_week)
+    rows = power_rankings([week_scores_from_league_week(league_week) for league_week in weeks])
+    assert dict(season.luck()) == pytest.approx({row["name"]: row["luck"] for row in rows})
+
+
+def test_teams_are_told_apart_by_id():
+    weeks = [
+        LeagueWeek("sleeper", 1, 1, [
+            TeamWeek(1, "Unknown Team", 100.0, None, 1, []),
+            TeamWeek(2, "Unknown Team", 90.0, None, 1, []),
+        ]),
+        LeagueWeek("sleeper", 1, 2, [
+            TeamWeek(1, "Renamed", 80.0, None, 1, []),
+            TeamWeek(2, "Unknown Team", 95.0, None, 1, []),
+        ]),
+    ]
+    rows = power_rankings([week_scores_from_league_week(league_week) for league_week in weeks])
+    assert {row["team_id"]: (row["name"], row["wins"]) for row in rows} == {1: ("Renamed", 1.0), 2: ("Unknown Team", 1.0)}
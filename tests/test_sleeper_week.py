@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from utils.sleeper_helper import LeagueIndex
+from utils.week_model import league_week_from_sleeper
+from utils.week_stats import compute_week_stats
+
+
+# The separate passes over the matchups that generate_sleeper_summary used to make
+
+def reference_scoreboards(matchups, user_team_mapping, roster_owner_mapping):
+    scoreboards = {}
+    for matchup in matchups:
+        team_name = user_team_mapping.get(roster_owner_mapping.get(matchup.get('roster_id')), "Unknown Team")
+        scoreboards.setdefault(matchup.get('matchup_id'), []).append((team_name, matchup.get('points', 0)))
+    return {key: sorted(teams, key=lambda x: -x[1]) for key, teams in scoreboards.items()}
+
+
+def reference_highest_player(matchups, players_data, user_team_mapping, roster_owner_mapping):
+    highest = (None, -1, "Unknown Team")
+    for matchup in matchups:
+        team_name = user_team_mapping.get(roster_owner_mapping.get(matchup['roster_id']), "Unknown Team")
+        for player_id, score in matchup.get('players_points', {}).items():
+            if score > highest[1]:
+                highest = (player_id, score, team_name)
+    return players_data[highest[0]]['full_name'], highest[1], highest[2]
+
+
+def reference_lowest_starter(matchups, players_data, user_team_mapping, roster_owner_mapping):
+    lowest = (None, float('inf'), "Unknown Team")
+    for matchup in matchups:
+        team_name = user_team_mapping.get(roster_owner_mapping.get(matchup['roster_id']), "Unknown Team")
+        for player_id in matchup.get('starters') or []:
+            score = matchup.get('players_points', {}).get(player_id, 0)
+            if score < lowest[1]:
+                lowest = (player_id, score, team_name)
+    return players_data[lowest[0]]['full_name'], lowest[1], lowest[2]
+
+
+def reference_highest_benched(matchups, players_data, user_team_mapping, roster_owner_mapping):
+    highest = (None, float('-inf'), "Unknown Team")
+    for matchup in matchups:
+        team_name = user_team_mapping.get(roster_owner_mapping.get(matchup['roster_id']), "Unknown Team")
+        for player_id, score in matchup.get('players_points', {}).items():
+            if player_id not in matchup['starters'] and score > highest[1]:
+                highest = (player_id, score, team_name)
+    if highest[0] is None:
+        return None, None, "Unknown Team"
+    return players_data[highest[0]]['full_name'], highest[1], highest[2]
+
+
+def random_league(rng, n_teams):
+    users = [{'user_id': f"u{i}", 'display_name': f"Owner {i}", 'metadata': {'team_name': f"Team {i}"}} for i in range(n_teams)]
+    # One orphaned roster without an owner shows up as "Unknown Team"
+    rosters = [{'roster_id': i + 1, 'owner_id': f"u{i}" if i else None} for i in range(n_teams)]
+    players_data = {}
+    matchups = []
+    for roster in rosters:
+        players_points = {}
+        for _ in range(rng.randint(1, 10)):
+            player_id = str(len(players_data))
+            players_data[player_id] = {'full_name': f"Player {player_id}", 'position': 'WR'}
+            # Distinct scores, the old helpers and the week model visit players in different orders
+            players_points[player_id] = round(rng.uniform(0, 40), 2) + len(players_data) * 1e-6
+        # Sleeper lists every starter in players_points; some lineups are empty
+        starters = rng.sample(sorted(players_points), rng.randint(0, len(players_points)))
+        matchups.append({
+            'roster_id': roster['roster_id'],
+            'matchup_id': (roster['roster_id'] + 1) // 2,
+            # Distinct team scores too, even for empty lineups
+            'points': round(sum(players_points[player_id] for player_id in starters), 2) + roster['roster_id'] * 1e-4,
+            'starters': starters,
+            'players_points': players_points,
+        })
+    return rosters, users, players_data, matchups
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_week_matches_previous_sleeper_helpers(seed):
+    rng = random.Random(seed)
+    rosters, users, players_data, matchups = random_league(rng, rng.choice([2, 4, 10, 12]))
+    index = LeagueIndex(rosters, users)
+    mappings = (index.user_team_mapping, index.roster_owner_mapping)
+    stats = compute_week_stats(league_week_from_sleeper(matchups, index, players_data, 1, 1))
+
+    def described(player_and_team):
+        player, team = player_and_team
+        return player.name, player.points, team.name
+
+    assert described(stats['top_scorer']) == reference_highest_player(matchups, players_data, *mappings)
+    if any(matchup['starters'] for matchup in matchups):
+        assert described(stats['lowest_starter']) == reference_lowest_starter(matchups, players_data, *mappings)
+    else:
+        assert stats['lowest_starter'] is None
+    benched = reference_highest_benched(matchups, players_data, *mappings)
+    assert (described(stats['highest_benched']) if stats['highest_benched'] else (None, None, "Unknown Team")) == benched
+
+    scoreboards = reference_scoreboards(matchups, *mappings)
+    top_team = max((team for teams in scoreboards.values() for team in teams), key=lambda team: team[1])
+    assert (stats['highest_scoring_team'].name, stats['highest_scoring_team'].points) == top_team
+    margins = [teams[0][1] - teams[1][1] for teams in scoreboards.values()]
+    assert stats['biggest_blowout'][2] == pytest.approx(max(margins))
+    assert stats['closest_game'][2] == pytest.approx(min(margins))
@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from utils.week_model import BENCH, INJURED_RESERVE, LeagueWeek, PlayerWeek, TeamWeek
+from utils.week_stats import BANGED_UP_STATUSES, WeekArrays, compute_week_stats
+
+
+def reference_week_stats(league_week):
+    # The per-player loop compute_week_stats replaced; ties go to the first in league order
+    top_scorer = worst_scorer = highest_benched = lowest_starter = None
+    highest_scoring_team = biggest_bust = most_banged_up = None
+
+    for team in league_week.teams:
+        banged_up = 0
+        for player in team.players:
+            points = player.points
+            if top_scorer is None or points > top_scorer[0].points:
+                top_scorer = (player, team)
+            if player.slot != INJURED_RESERVE and (worst_scorer is None or points < worst_scorer[0].points):
+                worst_scorer = (player, team)
+            if player.starter:
+                if lowest_starter is None or points < lowest_starter[0].points:
+                    lowest_starter = (player, team)
+            elif player.slot != INJURED_RESERVE and (highest_benched is None or points > highest_benched[0].points):
+                highest_benched = (player, team)
+            if player.injury_status in BANGED_UP_STATUSES:
+                banged_up += 1
+
+        if team.points is not None and (highest_scoring_team is None or team.points > highest_scoring_team.points):
+            highest_scoring_team = team
+        if team.projected is not None and team.points is not None:
+            bust = team.projected - team.points
+            if bust > 0 and (biggest_bust is None or bust > biggest_bust[1]):
+                biggest_bust = (team, bust)
+        if banged_up > 0 and (most_banged_up is None or banged_up > most_banged_up[1]):
+            most_banged_up = (team, banged_up)
+
+    biggest_blowout = closest_game = None
+    for first, second in league_week.matchups():
+        winner, loser = (first, second) if first.points >= second.points else (second, first)
+        margin = winner.points - loser.points
+        if biggest_blowout is None or margin > biggest_blowout[2]:
+            biggest_blowout = (winner, loser, margin)
+        if closest_game is None or margin < closest_game[2]:
+            closest_game = (winner, loser, margin)
+
+    return {
+        "top_scorer": top_scorer,
+        "worst_scorer": worst_scorer,
+        "highest_benched": highest_benched,
+        "lowest_starter": lowest_starter,
+        "highest_scoring_team": highest_scoring_team,
+        "biggest_blowout": biggest_blowout,
+        "closest_game": closest_game,
+        "biggest_bust": biggest_bust,
+        "most_banged_up": most_banged_up,
+    }
+
+
+def random_week(rng, n_teams):
+    # Whole-number points so players, teams and margins tie often
+    teams = []
+    for team_id in range(n_teams):
+        players = [
+            PlayerWeek(
+                f"{team_id}-{i}", f"Player {team_id}-{i}", "RB",
+                rng.choice(["QB", "RB", "WR", "FLEX", BENCH, BENCH, INJURED_RESERVE]),
+                float(rng.randint(0, 30)), float(rng.randint(0, 30)),
+                rng.choice([None, None, None, "Q", "O", "IR", "D", "PUP"]),
+            )
+            for i in range(rng.randint(0, 8))
+        ]
+        teams.append(TeamWeek(
+            team_id, f"Team {team_id}", float(rng.randint(80, 100)), rng.choice([None, float(rng.randint(80, 100))]),
+            team_id // 2 if team_id < n_teams - n_teams % 2 else None, players,
+        ))
+    rng.shuffle(teams)
+    return LeagueWeek("espn", 1, 1, teams)
+
+
+def identity(value):
+    # Stats hold the week's own records, so compare which records were picked
+    if value is None:
+        return None
+    if isinstance(value, tuple):
+        return tuple(identity(item) for item in value)
+    if isinstance(value, (PlayerWeek, TeamWeek)):
+        return id(value)
+    return pytest.approx(value)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_reference_loop_on_random_weeks(seed):
+    rng = random.Random(seed)
+    league_week = random_week(rng, rng.randint(1, 14))
+    expected = reference_week_stats(league_week)
+    actual = compute_week_stats(league_week)
+    assert {name: identity(value) for name, value in actual.items()} == {
+        name: identity(value) for name, value in expected.items()
+    }
+
+
+def test_accepts_prebuilt_arrays():
+    league_week = random_week(random.Random(0), 10)
+    assert compute_week_stats(WeekArrays(league_week)) == compute_week_stats(league_week)
+
+
+def test_missing_points_are_skipped():
+    scored = PlayerWeek("1", "Scored", "QB", "QB", 10.0, None, None)
+    unscored = PlayerWeek("2", "Unscored", "QB", "QB", None, None, None)
+    team = TeamWeek(1, "Team", None, None, None, [unscored, scored])
+    stats = compute_week_stats(LeagueWeek("sleeper", 1, 1, [team]))
+    assert stats["top_scorer"] == (scored, team)
+    assert stats["lowest_starter"] == (scored, team)
+    assert stats["highest_scoring_team"] is None
+    assert stats["biggest_blowout"] is None
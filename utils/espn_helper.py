@@ -1,5 +1,9 @@
 import re
 import time
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.week_model import league_week_from_espn
 #import datetime
 
 def clean_team_name(name):
@@ -7,6 +11,72 @@ def clean_team_name(name):
     cleaned_name = re.sub(r'[^\x00-\x7F]+', '', name)
     return cleaned_name.strip()
 
+# Step 0: Data Access
+
+class CachedLeague:
+    """
+    Memoizing proxy around an espn_api League object.
+    
+    `box_scores`, `scoreboard`, `standings` and `recent_activity` are cached per
+    (method, arguments) for the lifetime of the proxy, which should be one recap run.
+    Every other attribute is passed through to the wrapped league, so the proxy can be
+    handed to any helper in this module in place of the League.
+    
+    Args:
+    - league (League): The league object to wrap.
+    """
+
+    CACHED_METHODS = ("box_scores", "scoreboard", "standings", "recent_activity")
+
+    def __init__(self, league):
+        self._league = league
+        self._cache = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._stats = {name: {"hits": 0, "misses": 0} for name in self.CACHED_METHODS}
+
+    def __getattr__(self, name):
+        attr = getattr(self._league, name)
+        if name in self.CACHED_METHODS:
+            return lambda *args, **kwargs: self._call(name, attr, args, kwargs)
+        return attr
+
+    def _cache_key(self, name, method, args, kwargs):
+        # Bind against the signature so box_scores(3) and box_scores(week=3) share an entry
+        try:
+            bound = inspect.signature(method).bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (name, tuple(bound.arguments.items()))
+        except (TypeError, ValueError):
+            return (name, args, tuple(sorted(kwargs.items())))
+
+    def _call(self, name, method, args, kwargs):
+        key = self._cache_key(name, method, args, kwargs)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Concurrent callers of the same view wait for a single upstream request
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    self._stats[name]["hits"] += 1
+                    return self._cache[key]
+                self._stats[name]["misses"] += 1
+            result = method(*args, **kwargs)
+            with self._lock:
+                self._cache[key] = result
+            return result
+
+    def cache_stats(self):
+        """
+        Reports how many calls each cached method served from cache and how many went upstream.
+        
+        Returns:
+        - dict: Mapping of method name to {'hits': int, 'misses': int}.
+        """
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
+
+
 # Step 1: Basic Data Extraction
 
 def extract_teams_standings(league):
@@ -64,76 +134,61 @@ def extract_match_results(league, week):
     """
     return league.scoreboard(week)
 
-# Step 2: Top/Bottom Stats
 
-def top_three_teams(league):
+def fetch_week_data(league, week, max_workers=4):
     """
-    Determines the top 3 teams based on standings.
+    Fetches the independent ESPN views needed for a weekly recap concurrently.
+    
+    Standings, box scores and recent activity do not depend on each other, so they are
+    requested on a bounded thread pool and the recap waits roughly as long as the
+    slowest single request. When `league` is a CachedLeague, later helper calls for the
+    same views are served from its cache.
     
     Args:
     - league (League): The league object.
+    - week (int): The week number.
+    - max_workers (int): Maximum number of concurrent ESPN requests.
     
     Returns:
-    - List[Team]: List of top 3 teams.
+    - dict: Fetched data keyed by 'standings', 'box_scores' and 'activities'.
     """
-    standings = extract_teams_standings(league)
-    # Return the top 3 teams from the standings
-    return standings[:3]
-
+    fetches = {
+        "standings": lambda: extract_teams_standings(league),
+        "box_scores": lambda: extract_players_weekly_scores(league, week),
+        "activities": lambda: extract_recent_activities(league, size=100),
+    }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(fetch) for name, fetch in fetches.items()}
+        return {name: future.result() for name, future in futures.items()}
 
-def top_scorer_of_week(league, week):
+def fetch_league_week(league, week):
     """
-    Determines the top scoring player of a given week.
+    Fetches a week's box scores as a provider-agnostic LeagueWeek.
     
     Args:
     - league (League): The league object.
     - week (int): The week number.
     
     Returns:
-    - Tuple(Player, float): Top scoring player and their score.
+    - LeagueWeek: The normalized week.
     """
-    box_scores = extract_players_weekly_scores(league, week)
-    
-    max_score = float('-inf')
-    top_player = None
-    
-    for box_score in box_scores:
-        # Checking players from both home and away teams
-        for player in box_score.home_lineup + box_score.away_lineup:
-            if player.points > max_score:
-                max_score = player.points
-                top_player = player
-                
-    return top_player, max_score
+    return league_week_from_espn(extract_players_weekly_scores(league, week), league.league_id, week)
+
+# Step 2: Top/Bottom Stats
 
-def worst_scorer_of_week(league, week):
+def top_three_teams(league):
     """
-    Determines the worst scoring player of a given week.
+    Determines the top 3 teams based on standings.
     
     Args:
     - league (League): The league object.
-    - week (int): The week number.
     
     Returns:
-    - Tuple(Player, float): Worst scoring player and their score.
+    - List[Team]: List of top 3 teams.
     """
-    box_scores = extract_players_weekly_scores(league, week)
-    
-    min_score = float('inf')
-    worst_player = None
-    
-    for box_score in box_scores:
-        # Checking players from both home and away teams
-        for player in box_score.home_lineup + box_score.away_lineup:
-            # Ignore players in the IR slot
-            if player.slot_position == 'IR':
-                continue
-            if player.points < min_score:
-                min_score = player.points
-                worst_player = player
-                
-    return worst_player, min_score
-
+    standings = extract_teams_standings(league)
+    # Return the top 3 teams from the standings
+    return standings[:3]
 
 
 def top_scorer_of_season(league):
@@ -240,139 +295,3 @@ def team_with_most_injured_players(league):
     team_with_most_injured = max(injured_counts, key=injured_counts.get)
     
     return team_with_most_injured, injured_counts[team_with_most_injured], [player.name for player in team_with_most_injured.roster if player.injured]
-
-# Step 4: Player Bench/Starting Stats.
-
-def highest_scoring_benched_player(league, current_week):
-    """
-    Identify the benched player who scored the most points for a given week and the team that rosters them.
-    
-    Args:
-    - league (League): The league object.
-    - current_week (int): The week number.
-    
-    Returns:
-    - Tuple: Player object representing the highest scoring benched player and the Team object representing the team that rosters them.
-    """
-    box_scores = league.box_scores(current_week)
-    benched_highest_player = None
-    benched_highest_points = float('-inf')
-
-    for box_score in box_scores:
-        for player in box_score.home_lineup + box_score.away_lineup:
-            if player.slot_position == 'BE' and player.points > benched_highest_points:
-                benched_highest_points = player.points
-                benched_highest_player = (player, box_score.home_team if player in box_score.home_lineup else box_score.away_team)
-
-    return benched_highest_player
-
-def lowest_scoring_starting_player(league, current_week):
-    """
-    Identify the starting player who scored the least points for a given week and the team that rosters them.
-    
-    Args:
-    - league (League): The league object.
-    - current_week (int): The week number.
-    
-    Returns:
-    - Tuple: Player object representing the lowest scoring starting player and the Team object representing the team that rosters them.
-    """
-    box_scores = league.box_scores(current_week)
-    current_week_lowest_player = None
-    current_week_lowest_points = float('inf')
-
-    for box_score in box_scores:
-        for player in box_score.home_lineup + box_score.away_lineup:
-            if player.slot_position != 'BE' and player.points < current_week_lowest_points:
-                current_week_lowest_points = player.points
-                current_week_lowest_player = (player, box_score.home_team if player in box_score.home_lineup else box_score.away_team)
-
-    return current_week_lowest_player
-
-# Step 5: Match Stats
-
-def biggest_blowout_match(league, week):
-    """
-    Identifies the biggest blowout match of the current week.
-    
-    Args:
-    - league (League): The league object.
-    - week (int): The week number.
-    
-    Returns:
-    - BoxScore: Box score of the match with the largest score difference.
-    """
-    box_scores = league.box_scores(week)
-    max_diff = float('-inf')
-    blowout_match = None
-
-    for match in box_scores:
-        diff = abs(match.home_score - match.away_score)
-        if diff > max_diff:
-            max_diff = diff
-            blowout_match = match
-
-    if blowout_match:
-        return blowout_match
-        # return f"Box Score({blowout_match.home_team.team_name} ({blowout_match.home_score}) at {blowout_match.away_team.team_name} ({blowout_match.away_score}))"
-    return None
-
-
-def closest_game_match(league, week):
-    """
-    Identifies the closest game of the current week.
-    
-    Args:
-    - league (League): The league object.
-    - week (int): The week number.
-    
-    Returns:
-    - BoxScore: Box score of the match with the smallest score difference.
-    """
-    box_scores = league.box_scores(week)
-    min_diff = float('inf')
-    closest_match = None
-
-    for match in box_scores:
-        diff = abs(match.home_score - match.away_score)
-        if diff < min_diff:
-            min_diff = diff
-            closest_match = match
-
-    if closest_match:
-        # return f"Box Score({closest_match.home_team.team_name} ({closest_match.home_score}) at {closest_match.away_team.team_name} ({closest_match.away_score}))"
-        return closest_match
-    return None
-
-
-def highest_scoring_team(league: int, week: int) -> str:
-    """
-    Returns a formatted string with the top scoring team's name and their score for a given league.
-    
-    Parameters:
-    - league: An instance of the League class and week number
-    
-    Returns:
-    - str: Formatted string "Team Name (Score)"
-    """
-    # Get the matchups for the specified week
-    matchups = league.scoreboard(week)
-    
-    # Determine the team with the highest score for the week
-    max_score = 0
-    top_team = None
-    for matchup in matchups:
-        if matchup.home_score > max_score:
-            max_score = matchup.home_score
-            top_team = matchup.home_team
-        if matchup.away_score > max_score:
-            max_score = matchup.away_score
-            top_team = matchup.away_team
-    
-    # Return the team name and score in the desired format
-    return f"{top_team.team_name} ({max_score})"
-
-
-
-
-
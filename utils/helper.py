@@ -21,7 +21,7 @@ def get_current_week(current_date):
     date_week_dict = {
     '9/3/2024': 1, '9/10/2024': 2, '9/17/2024': 3, '9/24/2024': 4,
     '10/1/2024': 5, '10/8/2024': 6, '10/15/2024': 7, '10/22/2024': 8,
-    '10/28/2024': 9, '11/4/2024': 10, '11/11/2024': 11, '11/18/2024': 12,
+    '10/29/2024': 9, '11/4/2024': 10, '11/11/2024': 11, '11/18/2024': 12,
     '11/25/2024': 13, '12/2/2024': 14, '12/9/2024': 15, '12/16/2024': 16
     }
     # Convert the string dates to datetime objects
@@ -35,3 +35,14 @@ def get_current_week(current_date):
         if current_date >= date:
             return date_week_dict_converted[date]
     return None  # If current date is before all the dates in the dictionary
+
+
+def get_nfl_season(current_date):
+    # The NFL season is named after the year it starts in; January and February games belong to the previous one
+    return current_date.year if current_date.month >= 3 else current_date.year - 1
+
+
+def is_week_final(week, current_week):
+    # Stat corrections can still change the most recently completed week, so only weeks
+    # at least two weeks behind the one in progress are treated as final
+    return week <= current_week - 2
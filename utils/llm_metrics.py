@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from collections import deque
+
+# Number of individual recap records kept for JSON export
+DEFAULT_MAX_RECORDS = 500
+
+
+class RecapTimer:
+    """
+    Measures one streamed recap: time to first token, total time and token counts.
+
+    Call `on_content` for every content chunk, `on_usage` with the usage block the API
+    sends at the end of the stream, then `finish` exactly once.
+
+    `request_start` (a `time.perf_counter()` value) is when the user's request started.
+    A hedged backup request passes the start of the original request, so its time to
+    first token and total time are what the user waited, and the delay before the
+    backup was sent is recorded as `hedge_delay_seconds`.
+    """
+
+    def __init__(self, sink, model, request_start=None):
+        self.sink = sink
+        self.model = model
+        self.start = time.perf_counter()
+        self.request_start = self.start if request_start is None else request_start
+        self.first_token_at = None
+        self.content_chunks = 0
+        self.prompt_tokens = None
+        self.completion_tokens = None
+
+    def on_content(self, content):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.content_chunks += 1
+
+    def on_usage(self, usage):
+        if usage is not None:
+            self.prompt_tokens = usage.prompt_tokens
+            self.completion_tokens = usage.completion_tokens
+
+    def finish(self, failed=False, cancelled=False):
+        total = time.perf_counter() - self.request_start
+        ttft = self.first_token_at - self.request_start if self.first_token_at is not None else None
+        # Streams without a usage block are counted by content chunk (about one token each)
+        completion_tokens = self.completion_tokens if self.completion_tokens is not None else self.content_chunks
+        generation = total - ttft if ttft is not None else None
+        record = {
+            "timestamp": time.time(),
+            "model": self.model,
+            "failed": failed,
+            "cancelled": cancelled,
+            "ttft_seconds": ttft,
+            "hedge_delay_seconds": self.start - self.request_start,
+            "total_seconds": total,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_per_second": completion_tokens / generation if generation else None,
+        }
+        self.sink.record(record)
+        return record
+
+
+class LLMMetrics:
+    """
+    Process-local sink for LLM streaming metrics.
+
+    Keeps the most recent per-recap records plus running totals per model, and exports
+    them as JSON or in the Prometheus text exposition format.
+
+    Args:
+    - max_records (int): Number of individual records kept.
+    """
+
+    def __init__(self, max_records=DEFAULT_MAX_RECORDS):
+        self._records = deque(maxlen=max_records)
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def timer(self, model, request_start=None):
+        return RecapTimer(self, model, request_start)
+
+    def _model_totals(self, model):
+        return self._totals.setdefault(model, {
+            "recaps": 0, "failures": 0, "cancelled": 0, "cache_hits": 0,
+            "ttft_seconds_sum": 0.0, "ttft_count": 0,
+            "total_seconds_sum": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+        })
+
+    def record(self, record):
+        with self._lock:
+            self._records.append(record)
+            totals = self._model_totals(record["model"])
+            # Hedged attempts that lost the race are only counted
+            if record["cancelled"]:
+                totals["cancelled"] += 1
+                return
+            totals["recaps"] += 1
+            totals["failures"] += int(record["failed"])
+            totals["total_seconds_sum"] += record["total_seconds"]
+            totals["prompt_tokens"] += record["prompt_tokens"] or 0
+            totals["completion_tokens"] += record["completion_tokens"] or 0
+            if record["ttft_seconds"] is not None:
+                totals["ttft_seconds_sum"] += record["ttft_seconds"]
+                totals["ttft_count"] += 1
+
+    def record_cache_hit(self, model):
+        with self._lock:
+            self._model_totals(model)["cache_hits"] += 1
+
+    def to_json(self):
+        with self._lock:
+            return json.dumps({"totals": self._totals, "records": list(self._records)}, indent=2)
+
+    def to_prometheus(self):
+        lines = []
+        metrics = [
+            ("commish_llm_recaps_total", "counter", "Streamed recaps generated", "recaps"),
+            ("commish_llm_failures_total", "counter", "Recaps that failed", "failures"),
+            ("commish_llm_cancelled_total", "counter", "Hedged requests cancelled after losing the race", "cancelled"),
+            ("commish_llm_cache_hits_total", "counter", "Recaps replayed from the recap cache", "cache_hits"),
+            ("commish_llm_prompt_tokens_total", "counter", "Prompt tokens sent", "prompt_tokens"),
+            ("commish_llm_completion_tokens_total", "counter", "Completion tokens received", "completion_tokens"),
+        ]
+        summaries = [
+            ("commish_llm_ttft_seconds", "Time to first token", "ttft_seconds_sum", "ttft_count"),
+            ("commish_llm_duration_seconds", "Total recap generation time", "total_seconds_sum", "recaps"),
+        ]
+        with self._lock:
+            for name, metric_type, help_text, field in metrics:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for model, totals in sorted(self._totals.items()):
+                    lines.append(f'{name}{{model="{model}"}} {totals[field]}')
+            for name, help_text, sum_field, count_field in summaries:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} summary")
+                for model, totals in sorted(self._totals.items()):
+                    lines.append(f'{name}_sum{{model="{model}"}} {totals[sum_field]}')
+                    lines.append(f'{name}_count{{model="{model}"}} {totals[count_field]}')
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every Streamlit session in the process
+LLM_METRICS = LLMMetrics()
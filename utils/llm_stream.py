@@ -0,0 +1,210 @@
+import os
+import queue
+import threading
+import time
+from streamlit.logger import get_logger
+from utils.llm_metrics import LLM_METRICS
+
+LOGGER = get_logger(__name__)
+
+# Seconds to wait for a first token before starting a backup request (unset disables hedging)
+HEDGE_AFTER_SECONDS = float(os.environ["COMMISH_LLM_HEDGE_AFTER"]) if os.environ.get("COMMISH_LLM_HEDGE_AFTER") else None
+# Model used for the backup request, defaults to the primary model
+HEDGE_FALLBACK_MODEL = os.environ.get("COMMISH_LLM_HEDGE_MODEL") or None
+MAX_TOKENS = 800
+
+
+def _create_stream(client, model, messages, max_tokens):
+    return client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens,  # Control response length
+        stream=True,  # Enable streaming
+        stream_options={"include_usage": True}  # Final chunk carries token counts
+    )
+
+
+class _Attempt:
+    """
+    One streamed completion consumed on a background thread.
+
+    Events are put on the shared queue as (attempt, kind, payload) where kind is
+    "content", "usage", "done" or "error".
+    """
+
+    def __init__(self, client, model, messages, max_tokens, events, request_start):
+        self.client = client
+        self.model = model
+        self.messages = messages
+        self.max_tokens = max_tokens
+        self.events = events
+        # Timed from the original request so a backup reports what the user waited
+        self.timer = LLM_METRICS.timer(model, request_start)
+        self.finished = False
+        self._cancelled = threading.Event()
+        self._response = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        response = None
+        try:
+            response = _create_stream(self.client, self.model, self.messages, self.max_tokens)
+            self._response = response
+            for chunk in response:
+                if self._cancelled.is_set():
+                    break
+                # The usage chunk at the end of the stream has no choices
+                if not chunk.choices:
+                    self.events.put((self, "usage", chunk.usage))
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    self.events.put((self, "content", content))
+            self.events.put((self, "done", None))
+        except Exception as e:
+            self.events.put((self, "error", e))
+        finally:
+            if self._cancelled.is_set() and response is not None:
+                self._close(response)
+
+    @staticmethod
+    def _close(response):
+        try:
+            response.close()
+        except Exception:
+            pass
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._response is not None:
+            self._close(self._response)
+        self.finish(cancelled=True)
+
+    def finish(self, failed=False, cancelled=False):
+        if self.finished:
+            return None
+        self.finished = True
+        return self.timer.finish(failed=failed, cancelled=cancelled)
+
+
+def _single_stream(client, messages, model, max_tokens):
+    timer = LLM_METRICS.timer(model)
+    try:
+        for chunk in _create_stream(client, model, messages, max_tokens):
+            # Log the chunk to inspect its structure
+            LOGGER.debug(f"Received chunk: {chunk}")
+            # The usage chunk at the end of the stream has no choices
+            if not chunk.choices:
+                timer.on_usage(chunk.usage)
+                continue
+            content = chunk.choices[0].delta.content
+            # Skip empty chunks
+            if not content:
+                continue
+            timer.on_content(content)
+            yield model, content
+    except Exception:
+        timer.finish(failed=True)
+        raise
+    LOGGER.info(f"Recap metrics: {timer.finish()}")
+
+
+def _hedged_stream(client, messages, model, max_tokens, hedge_after, fallback_model):
+    events = queue.Queue()
+    request_start = time.perf_counter()
+    attempts = [_Attempt(client, model, messages, max_tokens, events, request_start).start()]
+    deadline = time.monotonic() + hedge_after
+    winner = None
+    last_error = None
+
+    def start_backup(reason):
+        backup_model = fallback_model or model
+        LOGGER.info(f"{reason}, hedging with {backup_model}")
+        attempts.append(_Attempt(client, backup_model, messages, max_tokens, events, request_start).start())
+
+    try:
+        # Race the attempts until one of them produces content
+        while winner is None:
+            if len(attempts) == 1:
+                timeout = max(0.0, deadline - time.monotonic())
+            else:
+                timeout = None
+            try:
+                attempt, kind, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                start_backup(f"No first token from {model} after {hedge_after}s")
+                continue
+            if kind == "content":
+                winner = attempt
+                first_content = payload
+            elif kind == "usage":
+                attempt.timer.on_usage(payload)
+            else:
+                # Finished or failed without producing any content
+                if kind == "error":
+                    last_error = payload
+                    LOGGER.warning(f"Hedged request to {attempt.model} failed: {payload}")
+                attempt.finish(failed=kind == "error")
+                if len(attempts) == 1:
+                    start_backup(f"{model} returned no content")
+                elif all(a.finished for a in attempts):
+                    if last_error is not None:
+                        raise last_error
+                    return
+
+        for attempt in attempts:
+            if attempt is not winner and not attempt.finished:
+                attempt.cancel()
+        winner.timer.on_content(first_content)
+        yield winner.model, first_content
+
+        while True:
+            attempt, kind, payload = events.get()
+            if attempt is not winner:
+                continue
+            if kind == "content":
+                winner.timer.on_content(payload)
+                yield winner.model, payload
+            elif kind == "usage":
+                winner.timer.on_usage(payload)
+            elif kind == "done":
+                LOGGER.info(f"Recap metrics: {winner.finish()}")
+                return
+            else:
+                winner.finish(failed=True)
+                raise payload
+    finally:
+        # Also reached when the consumer stops reading early
+        for attempt in attempts:
+            if not attempt.finished:
+                attempt.cancel()
+
+
+def stream_completion(client, messages, model, hedge_after=None, fallback_model=None, max_tokens=MAX_TOKENS):
+    """
+    Streams a chat completion, optionally hedged against a slow first token.
+
+    Without `hedge_after` this is a plain streamed completion. With it, a backup
+    request (to `fallback_model`, or the same model) is started if no first token
+    arrives within `hedge_after` seconds or the first request fails before producing
+    any content. Whichever request produces content first is streamed and the other
+    is cancelled. Every request is recorded in `LLM_METRICS`.
+
+    Args:
+    - client: OpenAI client (or the `openai` module); point it at another base URL to
+      use an OpenAI-compatible server.
+    - messages (List[dict]): Chat messages.
+    - model (str): The primary chat model.
+    - hedge_after (float): First token deadline in seconds, None to disable hedging.
+    - fallback_model (str): Model for the backup request.
+    - max_tokens (int): Maximum completion length.
+
+    Yields:
+    - Tuple(str, str): The model serving the stream and the next content chunk.
+    """
+    if hedge_after is None:
+        return _single_stream(client, messages, model, max_tokens)
+    return _hedged_stream(client, messages, model, max_tokens, hedge_after, fallback_model)
@@ -0,0 +1,217 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+# Only the fields the recaps actually use are kept in the derived artifacts
+PLAYER_FIELDS = ("full_name", "position", "team", "injury_status")
+
+# Bump whenever the layout of the slim artifact or the index changes
+SCHEMA_VERSION = 2
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE_PATH = os.path.join(ROOT_DIR, "players.sqlite")
+DEFAULT_SLIM_PATH = os.path.join(ROOT_DIR, "players_slim.json.gz")
+
+
+def slim_manifest_path(slim_path):
+    return slim_path.replace(".json.gz", ".meta.json")
+
+
+def _slim_columns(players_data):
+    players = sorted((str(player_id), player) for player_id, player in players_data.items())
+    columns = {"player_id": [player_id for player_id, _ in players]}
+    for field in PLAYER_FIELDS:
+        columns[field] = [player.get(field) for _, player in players]
+    return columns
+
+
+def write_slim_players(players_data, slim_path=DEFAULT_SLIM_PATH):
+    """
+    Writes the compact, versioned players artifact derived from the full Sleeper dump.
+
+    The artifact stores one column per field (player_id plus `PLAYER_FIELDS`) as
+    gzipped JSON, and a small manifest next to it records the schema version and a
+    content hash so cached copies can be checked for staleness without downloading the
+    artifact itself.
+
+    Args:
+    - players_data (dict): Mapping of player_id to the full Sleeper player record.
+    - slim_path (str): Where to write the artifact.
+
+    Returns:
+    - dict: The manifest that was written.
+    """
+    columns = _slim_columns(players_data)
+    payload = json.dumps(columns, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "content_hash": hashlib.sha256(payload).hexdigest(),
+        "player_count": len(columns["player_id"]),
+    }
+    artifact = {"schema_version": SCHEMA_VERSION, "content_hash": manifest["content_hash"], "columns": columns}
+    # mtime=0 keeps the file byte-identical when the players did not change
+    with open(slim_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(json.dumps(artifact, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+    with open(slim_manifest_path(slim_path), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def parse_slim_players(data):
+    """
+    Parses the bytes of a slim players artifact.
+
+    Args:
+    - data (bytes): Gzipped artifact as written by `write_slim_players`.
+
+    Returns:
+    - Tuple(str, dict): Content hash and a mapping of player_id to the `PLAYER_FIELDS` that are set.
+
+    Raises:
+    - ValueError: If the artifact has an unsupported schema version.
+    """
+    artifact = json.loads(gzip.decompress(data))
+    if artifact.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported players artifact schema version: {artifact.get('schema_version')}")
+    columns = artifact["columns"]
+    players = {}
+    for i, player_id in enumerate(columns["player_id"]):
+        # Omit missing fields so callers' .get() defaults still apply
+        players[player_id] = {field: columns[field][i] for field in PLAYER_FIELDS if columns[field][i] is not None}
+    return artifact["content_hash"], players
+
+
+def read_slim_players(slim_path=DEFAULT_SLIM_PATH):
+    with open(slim_path, "rb") as f:
+        return parse_slim_players(f.read())
+
+
+def build_player_store(players_data, db_path=DEFAULT_STORE_PATH, content_hash=None):
+    """
+    Builds the on-disk players index from the Sleeper `get_all_players()` dictionary.
+
+    The index is written to a temporary file and moved into place, so readers never see
+    a partially written store.
+
+    Args:
+    - players_data (dict): Mapping of player_id to the Sleeper player record.
+    - db_path (str): Where to write the SQLite index.
+    - content_hash (str): Hash of the slim artifact the index was built from, if any.
+
+    Returns:
+    - int: Number of players written.
+    """
+    # Unique per writer so concurrent rebuilds do not clobber each other
+    tmp_path = f"{db_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(
+            "CREATE TABLE players (player_id TEXT PRIMARY KEY, "
+            + ", ".join(f"{field} TEXT" for field in PLAYER_FIELDS)
+            + ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        rows = [
+            (str(player_id),) + tuple(player.get(field) for field in PLAYER_FIELDS)
+            for player_id, player in players_data.items()
+        ]
+        conn.executemany(f"INSERT INTO players VALUES (?{', ?' * len(PLAYER_FIELDS)})", rows)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("schema_version", str(SCHEMA_VERSION)), ("content_hash", content_hash)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return len(rows)
+
+
+class PlayerStore:
+    """
+    Read-only lookup of Sleeper players by player_id backed by the SQLite index.
+
+    Supports the subset of the dict interface the sleeper helpers use
+    (`player_id in store`, `store[player_id].get('full_name')`), so it can be passed
+    anywhere the full players dictionary was used.
+
+    Args:
+    - db_path (str): Path to an index written by `build_player_store`.
+    """
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def schema_version(self):
+        version = self._meta("schema_version")
+        return int(version) if version else None
+
+    @property
+    def content_hash(self):
+        return self._meta("content_hash")
+
+    def get(self, player_id, default=None):
+        row = self._conn.execute(
+            f"SELECT {', '.join(PLAYER_FIELDS)} FROM players WHERE player_id = ?", (str(player_id),)
+        ).fetchone()
+        if row is None:
+            return default
+        # Omit missing fields so callers' .get() defaults still apply
+        return {field: value for field, value in zip(PLAYER_FIELDS, row) if value is not None}
+
+    def __getitem__(self, player_id):
+        player = self.get(player_id)
+        if player is None:
+            raise KeyError(player_id)
+        return player
+
+    def __contains__(self, player_id):
+        return self.get(player_id) is not None
+
+    def close(self):
+        self._conn.close()
+
+
+def open_player_store(db_path=DEFAULT_STORE_PATH, slim_path=DEFAULT_SLIM_PATH):
+    """
+    Opens the players index, rebuilding it from the slim artifact when it is missing or stale.
+
+    Args:
+    - db_path (str): Path of the SQLite index.
+    - slim_path (str): Path of the slim players artifact.
+
+    Returns:
+    - PlayerStore: The store, or None if neither a current index nor a readable artifact exist.
+    """
+    if os.path.exists(slim_path):
+        with open(slim_manifest_path(slim_path)) as f:
+            manifest = json.load(f)
+        store = PlayerStore(db_path) if os.path.exists(db_path) else None
+        if store is not None and store.schema_version == SCHEMA_VERSION and store.content_hash == manifest["content_hash"]:
+            return store
+        if store is not None:
+            store.close()
+        try:
+            content_hash, players = read_slim_players(slim_path)
+        except ValueError:
+            # Artifact from an older schema, wait for the next data update
+            return None
+        build_player_store(players, db_path, content_hash)
+    elif not os.path.exists(db_path):
+        return None
+    store = PlayerStore(db_path)
+    if store.schema_version != SCHEMA_VERSION:
+        store.close()
+        return None
+    return store
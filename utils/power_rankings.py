@@ -0,0 +1,155 @@
+import numpy as np
+
+
+def week_scores_from_league_week(league_week):
+    """
+    Converts a LeagueWeek into matchups, each a list of (team id, team name, points).
+    A team on a bye is a matchup of its own.
+    """
+    paired = set()
+    matchups = []
+    for first, second in league_week.matchups():
+        matchups.append([(first.team_id, first.name, first.points), (second.team_id, second.name, second.points)])
+        paired.update((id(first), id(second)))
+    matchups.extend(
+        [(team.team_id, team.name, team.points)]
+        for team in league_week.teams if id(team) not in paired and team.points is not None
+    )
+    return matchups
+
+
+def all_play_wins(scores):
+    """
+    All-play wins of every score against the rest of the week, ties counting as half a win.
+
+    Computed from the sorted scores in O(n log n) instead of comparing every pair: a
+    team beats everyone ranked below it and splits with everyone tied with it.
+
+    Args:
+    - scores (np.ndarray): The week's team scores.
+
+    Returns:
+    - np.ndarray: All-play wins per team; each team played len(scores) - 1 games.
+    """
+    ordered = np.sort(scores)
+    below = np.searchsorted(ordered, scores, side="left")
+    tied = np.searchsorted(ordered, scores, side="right") - below - 1
+    return below + tied / 2
+
+
+def power_rankings(weeks):
+    """
+    All-play power rankings and luck over several weeks.
+
+    Each week's all-play record comes from ranking that week's scores. Expected wins are
+    the all-play win rate of each week with a head-to-head game summed over the season,
+    and luck is actual wins minus expected wins.
+
+    Args:
+    - weeks (List[List[List[Tuple]]]): Matchups of every week in order, as returned by
+      `week_scores_from_league_week`.
+
+    Returns:
+    - List[dict]: One row per team id ordered by all-play win rate, with 'team_id',
+      'name' (the latest one), 'all_play_wins', 'all_play_losses', 'weekly' (all-play
+      (wins, losses) per week, None when the team did not play), 'wins',
+      'expected_wins' and 'luck'.
+    """
+    # Teams are told apart by id; names repeat ('Unknown Team') and change mid-season
+    index = {}
+    names = {}
+    for matchups in weeks:
+        for matchup in matchups:
+            for team_id, name, _ in matchup:
+                index.setdefault(team_id, len(index))
+                names[team_id] = name
+
+    # Weeks x teams matrices; NaN marks a team without a score that week
+    scores = np.full((len(weeks), len(index)), np.nan)
+    actual = np.zeros((len(weeks), len(index)))
+    decided = np.zeros((len(weeks), len(index)), dtype=bool)
+    for w, matchups in enumerate(weeks):
+        for matchup in matchups:
+            for team_id, _, points in matchup:
+                if points is not None:
+                    scores[w, index[team_id]] = points
+            if len(matchup) == 2 and None not in (matchup[0][2], matchup[1][2]):
+                (first, _, first_points), (second, _, second_points) = matchup
+                result = np.sign(first_points - second_points) / 2 + 0.5
+                actual[w, index[first]] += result
+                actual[w, index[second]] += 1 - result
+                decided[w, [index[first], index[second]]] = True
+
+    wins = np.full(scores.shape, np.nan)
+    games = np.zeros(scores.shape)
+    for w in range(len(weeks)):
+        played = ~np.isnan(scores[w])
+        wins[w, played] = all_play_wins(scores[w, played])
+        games[w, played] = played.sum() - 1
+
+    season_wins = np.nansum(wins, axis=0)
+    season_games = games.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Byes have no actual result, so they add nothing to expected wins either
+        expected = np.nansum(np.where(decided & (games > 0), wins / games, np.nan), axis=0)
+        win_rate = np.where(season_games > 0, season_wins / season_games, 0.0)
+
+    rows = []
+    for team_id, t in index.items():
+        rows.append({
+            "team_id": team_id,
+            "name": names[team_id],
+            "all_play_wins": float(season_wins[t]),
+            "all_play_losses": float(season_games[t] - season_wins[t]),
+            "weekly": [
+                None if np.isnan(wins[w, t]) else (float(wins[w, t]), float(games[w, t] - wins[w, t]))
+                for w in range(len(weeks))
+            ],
+            "wins": float(actual[:, t].sum()),
+            "expected_wins": float(expected[t]),
+            "luck": float(actual[:, t].sum() - expected[t]),
+            "_win_rate": win_rate[t],
+        })
+    rows.sort(key=lambda row: -row.pop("_win_rate"))
+    return rows
+
+
+def _format_record(wins, losses):
+    # Half wins come from ties
+    return f"{wins:g}-{losses:g}"
+
+
+def format_power_rankings(rows, weekly=False):
+    """
+    Formats power rankings as summary lines for the LLM.
+
+    Args:
+    - rows (List[dict]): Result of `power_rankings`.
+    - weekly (bool): Describe a single week instead of a season.
+
+    Returns:
+    - str: One line per team.
+    """
+    lines = []
+    for rank, row in enumerate(rows, start=1):
+        line = f"  {rank}. {row['name']} (all-play {_format_record(row['all_play_wins'], row['all_play_losses'])}"
+        if not weekly:
+            line += f", {row['wins']:g} actual wins vs {row['expected_wins']:.2f} expected, luck {row['luck']:+.2f}"
+        lines.append(line + ")")
+    return "\n".join(lines)
+
+
+def format_luck(season_luck):
+    """
+    Formats the luckiest and unluckiest teams from `SeasonAccumulator.luck()`.
+
+    Returns:
+    - List[str]: Summary lines, empty when there is no luck index yet.
+    """
+    if len(season_luck) < 2:
+        return []
+    (lucky, lucky_luck), (unlucky, unlucky_luck) = season_luck[0], season_luck[-1]
+    return [
+        f"Luckiest team of the season: {lucky} ({lucky_luck:+.2f} wins compared to their all-play expected wins)",
+        f"Unluckiest team of the season: {unlucky} ({unlucky_luck:+.2f} wins compared to their all-play expected wins)",
+    ]
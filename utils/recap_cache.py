@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from streamlit.logger import get_logger
+
+LOGGER = get_logger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RECAP_CACHE_PATH = os.environ.get(
+    "COMMISH_RECAP_CACHE_DB", os.path.join(ROOT_DIR, ".cache", "recaps.sqlite")
+)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("COMMISH_RECAP_CACHE_ENTRIES", 1000))
+
+
+def normalize_persona(persona):
+    # "  Dwight   Schrute " and "dwight schrute" describe the same character
+    return " ".join(str(persona).split()).casefold()
+
+
+def recap_key(summary, persona, trash_talk_level, model):
+    """
+    Hash identifying a generated recap by its inputs.
+    """
+    payload = json.dumps([summary, normalize_persona(persona), int(trash_talk_level), model])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def replay_chunks(text):
+    """
+    Splits cached recap text into word-sized chunks so it replays like a live stream.
+    """
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+class RecapCache:
+    """
+    Disk-backed LRU cache of generated recaps keyed by `recap_key`.
+
+    Entries live in SQLite so they survive restarts and are shared by every session
+    in the process. Reads refresh an entry's last access time and writes evict the
+    least recently used entries beyond `max_entries`.
+
+    Args:
+    - path (str): Path of the SQLite database, created if missing.
+    - max_entries (int): Maximum number of cached recaps.
+    """
+
+    def __init__(self, path=DEFAULT_RECAP_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS recaps (key TEXT PRIMARY KEY, text TEXT NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS recaps_last_access ON recaps (last_access)")
+            self._conn.commit()
+
+    def get(self, key):
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT text FROM recaps WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE recaps SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+                return row[0]
+        except sqlite3.Error:
+            LOGGER.exception("Failed to read from the recap cache")
+            return None
+
+    def put(self, key, text):
+        try:
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO recaps VALUES (?, ?, ?)", (key, text, time.time()))
+                self._conn.execute(
+                    "DELETE FROM recaps WHERE key IN"
+                    " (SELECT key FROM recaps ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._conn.commit()
+        except sqlite3.Error:
+            LOGGER.exception("Failed to write to the recap cache")
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+def get_recap_cache():
+    # One cache per process, shared by every Streamlit session
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = RecapCache()
+        return _CACHE
@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.logger import get_logger
+from utils.helper import is_week_final
+from utils.snapshot_store import get_snapshot_store
+from utils.season_stats import SeasonAccumulator, save_season
+from utils.power_rankings import format_luck, format_power_rankings, power_rankings, week_scores_from_league_week
+from utils.week_stats import compute_week_stats
+
+LOGGER = get_logger(__name__)
+
+# Default cap on weeks fetched at the same time for a season review
+SEASON_FETCH_WORKERS = 6
+
+
+def fetch_weeks_concurrently(fetch_week, weeks, max_workers=SEASON_FETCH_WORKERS):
+    """
+    Fetches several weeks on a bounded thread pool.
+
+    Args:
+    - fetch_week (Callable[[int], LeagueWeek]): Fetches one week.
+    - weeks (List[int]): The weeks to fetch.
+    - max_workers (int): Maximum number of weeks fetched at once.
+
+    Returns:
+    - dict: Week number to LeagueWeek.
+    """
+    if not weeks:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(weeks)))) as executor:
+        futures = {week: executor.submit(fetch_week, week) for week in weeks}
+        return {week: future.result() for week, future in futures.items()}
+
+
+def gather_season(platform, league_id, year, last_week, fetch_weeks):
+    """
+    Collects every completed week of a league, fetching only the weeks not stored yet.
+
+    Completed weeks are read from the snapshot store; the missing ones are fetched in
+    one call to `fetch_weeks` and stored for next time. The season totals are rebuilt
+    from the full run of weeks and saved as far as the weeks are final (see `save_season`).
+
+    Args:
+    - platform (str): 'espn', 'yahoo' or 'sleeper'.
+    - league_id: The league id.
+    - year (int): The season to collect.
+    - last_week (int): The last completed week.
+    - fetch_weeks (Callable[[List[int]], dict]): Fetches the given weeks concurrently and
+      returns them keyed by week number.
+
+    Returns:
+    - Tuple(List[LeagueWeek], SeasonAccumulator): Weeks 1 through `last_week` and the season totals.
+    """
+    store = get_snapshot_store()
+    league_weeks = {}
+    for week in range(1, last_week + 1):
+        league_week = store.get(platform, league_id, year, week, kind="league_week")
+        if league_week is not None:
+            league_weeks[week] = league_week
+    missing = [week for week in range(1, last_week + 1) if week not in league_weeks]
+
+    start_time = time.perf_counter()
+    fetched = fetch_weeks(missing) if missing else {}
+    LOGGER.info(
+        f"Season review for {platform} league {league_id}: {len(league_weeks)} weeks cached, "
+        f"{len(missing)} fetched in {time.perf_counter() - start_time:.2f} seconds"
+    )
+    for week, league_week in fetched.items():
+        store.put(platform, league_id, year, week, league_week, immutable=is_week_final(week, last_week + 1), kind="league_week")
+    league_weeks.update(fetched)
+
+    ordered = [league_weeks[week] for week in sorted(league_weeks)]
+    return ordered, save_season(platform, league_id, year, SeasonAccumulator(platform, league_id), ordered, last_week + 1)
+
+
+def _record(team):
+    record = f"{team['wins']}-{team['losses']}"
+    return record + f"-{team['ties']}" if team['ties'] else record
+
+
+def build_season_summary(league_weeks, season):
+    """
+    Builds the season in review summary handed to the LLM.
+
+    Args:
+    - league_weeks (List[LeagueWeek]): Every completed week, in order.
+    - season (SeasonAccumulator): Season totals over the same weeks.
+
+    Returns:
+    - str: The season summary.
+    """
+    best_team_week = best_player_week = blowout = closest = None
+    weekly_high_scores = {}
+    for league_week in league_weeks:
+        stats = compute_week_stats(league_week)
+        top_team, top_scorer = stats["highest_scoring_team"], stats["top_scorer"]
+        if top_team is not None:
+            weekly_high_scores[top_team.name] = weekly_high_scores.get(top_team.name, 0) + 1
+            if best_team_week is None or top_team.points > best_team_week[0].points:
+                best_team_week = (top_team, league_week.week)
+        if top_scorer is not None and (best_player_week is None or top_scorer[0].points > best_player_week[0].points):
+            best_player_week = top_scorer + (league_week.week,)
+        if stats["biggest_blowout"] is not None and (blowout is None or stats["biggest_blowout"][2] > blowout[2]):
+            blowout = stats["biggest_blowout"] + (league_week.week,)
+        if stats["closest_game"] is not None and (closest is None or stats["closest_game"][2] < closest[2]):
+            closest = stats["closest_game"] + (league_week.week,)
+
+    lines = [f"Season in review through week {season.last_week}", "Standings:"]
+    for rank, team in enumerate(season.records(), start=1):
+        lines.append(
+            f"  {rank}. {team['name']} ({_record(team)}) - {round(team['points_for'], 2)} points for, "
+            f"{round(team['points_against'], 2)} points against"
+        )
+    if season.top_scorer() is not None:
+        name, points = season.top_scorer()
+        lines.append(f"Top scoring player of the season: {name} with {round(points, 2)} points")
+    if season.worst_scorer() is not None:
+        name, points = season.worst_scorer()
+        lines.append(f"Worst scoring regular of the season: {name} with {round(points, 2)} points")
+    if best_player_week is not None:
+        player, team, week = best_player_week
+        lines.append(f"Best single-week player performance: {player.name} with {player.points} points in week {week} (Team: {team.name})")
+    if best_team_week is not None:
+        team, week = best_team_week
+        lines.append(f"Highest team score of the season: {team.name} with {round(team.points, 2)} points in week {week}")
+    if weekly_high_scores:
+        name, count = max(weekly_high_scores.items(), key=lambda item: item[1])
+        lines.append(f"Most weekly high scores: {name} ({count} weeks)")
+    if blowout is not None:
+        winner, loser, margin, week = blowout
+        lines.append(f"Biggest blowout of the season: {winner.name} ({winner.points}) vs {loser.name} ({loser.points}) in week {week} (Point Differential: {round(margin, 2)})")
+    if closest is not None:
+        winner, loser, margin, week = closest
+        lines.append(f"Closest game of the season: {winner.name} ({winner.points}) vs {loser.name} ({loser.points}) in week {week} (Point Differential: {round(margin, 2)})")
+    if season.hottest_streak() is not None:
+        name, streak = season.hottest_streak()
+        lines.append(f"Team on the hottest streak: {name} with a {streak} game win streak")
+    rankings = power_rankings([week_scores_from_league_week(league_week) for league_week in league_weeks])
+    if rankings:
+        lines.append(f"Power rankings (all-play record over the season):\n{format_power_rankings(rankings)}")
+    lines.extend(format_luck(season.luck()))
+    return "\n".join(lines)
@@ -0,0 +1,293 @@
+import copy
+import math
+import threading
+import time
+import numpy as np
+from streamlit.logger import get_logger
+from utils.helper import is_week_final
+from utils.power_rankings import all_play_wins
+from utils.snapshot_store import get_snapshot_store
+
+# Season state lives next to the weekly snapshots under this kind, with week 0
+SEASON_KIND = "season"
+SEASON_WEEK = 0
+
+LOGGER = get_logger(__name__)
+
+_SEASON_LOCK = threading.Lock()
+# (platform, league_id, year) of the seasons whose missing weeks are being fetched
+_BACKFILLS = set()
+
+
+class SeasonAccumulator:
+    """
+    Running season totals for one league, updated one completed week at a time.
+
+    Keeps per-player points and weeks rostered, and per-team points for and against,
+    win/loss/tie record, current streak and all-play totals for the luck index.
+    `apply_week` only touches the players and teams of that week, so keeping the season
+    current costs one week of work instead of a rescan of every roster. Weeks must be
+    applied in order; a week at or before the last applied one is ignored.
+
+    Args:
+    - platform (str): 'espn', 'yahoo' or 'sleeper'.
+    - league_id: The league id.
+    """
+
+    def __init__(self, platform, league_id):
+        self.platform = platform
+        self.league_id = league_id
+        self.weeks = []
+        # player_id -> [name, total points, weeks rostered]
+        self.players = {}
+        # team_id -> {'name', 'points_for', 'points_against', 'wins', 'losses', 'ties', 'streak',
+        #             'all_play_wins', 'all_play_games', 'expected_wins'}
+        self.teams = {}
+
+    @property
+    def last_week(self):
+        return self.weeks[-1] if self.weeks else 0
+
+    def covers(self, week):
+        """
+        Whether every week from 1 through `week` has been applied.
+        """
+        return self.weeks[:week] == list(range(1, week + 1))
+
+    def _team(self, team):
+        totals = self.teams.get(team.team_id)
+        if totals is None:
+            totals = self.teams[team.team_id] = {
+                "name": team.name, "points_for": 0.0, "points_against": 0.0,
+                "wins": 0, "losses": 0, "ties": 0, "streak": 0,
+                "all_play_wins": 0.0, "all_play_games": 0, "expected_wins": 0.0,
+            }
+        # Team names change during the season, keep the latest
+        totals["name"] = team.name
+        return totals
+
+    def apply_week(self, league_week):
+        """
+        Adds one completed week to the season totals.
+
+        Returns:
+        - bool: False if the week was already applied or is older than the last applied week.
+        """
+        if league_week.week <= self.last_week:
+            return False
+        for player, _ in league_week.players():
+            if player.points is None:
+                continue
+            totals = self.players.get(player.player_id)
+            if totals is None:
+                self.players[player.player_id] = [player.name, player.points, 1]
+            else:
+                totals[0] = player.name
+                totals[1] += player.points
+                totals[2] += 1
+        scored = [team for team in league_week.teams if team.points is not None]
+        all_play = {}
+        for team in scored:
+            self._team(team)["points_for"] += team.points
+        if len(scored) > 1:
+            wins = all_play_wins(np.array([team.points for team in scored], dtype=float))
+            for team, team_wins in zip(scored, wins):
+                all_play[id(team)] = float(team_wins)
+                totals = self._team(team)
+                totals["all_play_wins"] += float(team_wins)
+                totals["all_play_games"] += len(scored) - 1
+        for first, second in league_week.matchups():
+            if first.points is None or second.points is None:
+                continue
+            # Byes have no actual result, so they add nothing to expected wins either
+            for team in (first, second):
+                self._team(team)["expected_wins"] += all_play[id(team)] / (len(scored) - 1)
+            for team, opponent in ((first, second), (second, first)):
+                totals = self._team(team)
+                totals["points_against"] += opponent.points
+                if team.points > opponent.points:
+                    totals["wins"] += 1
+                    totals["streak"] = totals["streak"] + 1 if totals["streak"] > 0 else 1
+                elif team.points < opponent.points:
+                    totals["losses"] += 1
+                    totals["streak"] = totals["streak"] - 1 if totals["streak"] < 0 else -1
+                else:
+                    totals["ties"] += 1
+                    totals["streak"] = 0
+        self.weeks.append(league_week.week)
+        return True
+
+    def top_scorer(self):
+        """
+        Returns:
+        - Tuple(str, float): Name and season points of the top scoring player, or None.
+        """
+        if not self.players:
+            return None
+        name, points, _ = max(self.players.values(), key=lambda totals: totals[1])
+        return name, points
+
+    def worst_scorer(self, min_weeks=None):
+        """
+        Returns the lowest scoring player among those rostered for at least `min_weeks`
+        weeks (half of the applied weeks by default), so one-week pickups do not qualify.
+
+        Returns:
+        - Tuple(str, float): Name and season points, or None.
+        """
+        if min_weeks is None:
+            min_weeks = math.ceil(len(self.weeks) / 2)
+        qualified = [totals for totals in self.players.values() if totals[2] >= min_weeks]
+        if not qualified:
+            return None
+        name, points, _ = min(qualified, key=lambda totals: totals[1])
+        return name, points
+
+    def hottest_streak(self):
+        """
+        Returns:
+        - Tuple(str, int): Name and length of the team on the longest current win streak, or None.
+        """
+        if not self.teams:
+            return None
+        team = max(self.teams.values(), key=lambda totals: totals["streak"])
+        return team["name"], max(team["streak"], 0)
+
+    def luck(self):
+        """
+        Returns:
+        - List[Tuple(str, float)]: Team names and luck (actual wins, ties counting half,
+          minus all-play expected wins), luckiest first.
+        """
+        luck = [
+            (totals["name"], totals["wins"] + totals["ties"] / 2 - totals["expected_wins"])
+            for totals in self.teams.values()
+        ]
+        return sorted(luck, key=lambda item: -item[1])
+
+    def records(self):
+        """
+        Returns:
+        - List[dict]: Team season totals ordered by wins, then points for.
+        """
+        return sorted(self.teams.values(), key=lambda totals: (-totals["wins"], -totals["points_for"]))
+
+
+def load_season(platform, league_id, year):
+    season = get_snapshot_store().get(platform, league_id, year, SEASON_WEEK, kind=SEASON_KIND)
+    return season if season is not None else SeasonAccumulator(platform, league_id)
+
+
+def save_season(platform, league_id, year, season, league_weeks, current_week):
+    """
+    Applies weeks to a season and stores the result as far as the weeks are final.
+
+    Only final weeks (see `utils.helper.is_week_final`) go into the stored season, so
+    stat corrections to the newest week are picked up when it is applied for good.
+    Newer weeks are applied to a copy that is returned but not stored.
+
+    Args:
+    - platform (str): 'espn', 'yahoo' or 'sleeper'.
+    - league_id: The league id.
+    - year (int): The season.
+    - season (SeasonAccumulator): Season totals to extend.
+    - league_weeks (List[LeagueWeek]): The weeks following `season.last_week`, in order.
+    - current_week (int): The week in progress.
+
+    Returns:
+    - SeasonAccumulator: The season totals through the last of `league_weeks`.
+    """
+    pending = []
+    changed = False
+    for league_week in league_weeks:
+        if not pending and is_week_final(league_week.week, current_week):
+            changed |= season.apply_week(league_week)
+        else:
+            pending.append(league_week)
+    if changed:
+        get_snapshot_store().put(platform, league_id, year, SEASON_WEEK, season, immutable=True, kind=SEASON_KIND)
+    if pending:
+        season = copy.deepcopy(season)
+        for league_week in pending:
+            season.apply_week(league_week)
+    return season
+
+
+def _backfill_weeks(platform, league_id, year, weeks, current_week, fetch_weeks):
+    start_time = time.perf_counter()
+    try:
+        store = get_snapshot_store()
+        for week, league_week in fetch_weeks(weeks).items():
+            store.put(platform, league_id, year, week, league_week, immutable=is_week_final(week, current_week), kind="league_week")
+        LOGGER.info(
+            f"Backfilled weeks {weeks} of {platform} league {league_id} in {time.perf_counter() - start_time:.2f} seconds"
+        )
+    except Exception:
+        LOGGER.exception(f"Failed to backfill weeks {weeks} of {platform} league {league_id}")
+    finally:
+        with _SEASON_LOCK:
+            _BACKFILLS.discard((platform, str(league_id), year))
+
+
+def _start_backfill(platform, league_id, year, weeks, current_week, fetch_weeks):
+    key = (platform, str(league_id), year)
+    with _SEASON_LOCK:
+        if key in _BACKFILLS:
+            return
+        _BACKFILLS.add(key)
+    threading.Thread(
+        target=_backfill_weeks, args=(platform, league_id, year, weeks, current_week, fetch_weeks), daemon=True
+    ).start()
+
+
+def update_season(platform, league_id, year, league_week, current_week, fetch_weeks=None):
+    """
+    Brings the league's season totals up to a completed week.
+
+    Weeks between the stored season and `league_week` are read from the weekly
+    snapshots. If any of them is missing the week is not applied, since the season
+    would never cover it afterwards; the returned season then does not `cover` the
+    week and the recap falls back to its platform's season source. The missing weeks
+    are fetched with `fetch_weeks` on a background thread and stored, so a later
+    recap finds them without the fetch ever delaying a recap or failing it.
+    A week at or before the stored season's last week means the stored season is
+    stale, so it is rebuilt from week 1.
+
+    Args:
+    - platform (str): 'espn', 'yahoo' or 'sleeper'.
+    - league_id: The league id.
+    - year (int): The season the week belongs to.
+    - league_week (LeagueWeek): The completed week.
+    - current_week (int): The week in progress.
+    - fetch_weeks (Callable[[List[int]], dict]): Fetches the given weeks, keyed by
+      week number, like `utils.season_review.fetch_weeks_concurrently`. Called from a
+      background thread.
+
+    Returns:
+    - SeasonAccumulator: The season totals.
+    """
+    store = get_snapshot_store()
+    with _SEASON_LOCK:
+        season = load_season(platform, league_id, year)
+    if league_week.week <= season.last_week:
+        season = SeasonAccumulator(platform, league_id)
+
+    gap = range(season.last_week + 1, league_week.week)
+    league_weeks = {}
+    for week in gap:
+        stored = store.get(platform, league_id, year, week, kind="league_week")
+        if stored is not None:
+            league_weeks[week] = stored
+    missing = [week for week in gap if week not in league_weeks]
+    if missing:
+        if fetch_weeks is not None:
+            _start_backfill(platform, league_id, year, missing, current_week, fetch_weeks)
+        return season
+
+    with _SEASON_LOCK:
+        # Another recap may have stored more weeks in the meantime; it never goes past this one
+        stored = load_season(platform, league_id, year)
+        if season.last_week <= stored.last_week < league_week.week:
+            season = stored
+        ordered = [league_weeks[week] for week in range(season.last_week + 1, league_week.week)] + [league_week]
+        return save_season(platform, league_id, year, season, ordered, current_week)
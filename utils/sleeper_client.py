@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import httpx
+from sleeper_wrapper import League as SleeperLeague
+
+SLEEPER_API_URL = "https://api.sleeper.app/v1"
+SLEEPER_REQUEST_TIMEOUT = 10
+SLEEPER_MAX_CONNECTIONS = 10
+
+
+class PrefetchedLeague(SleeperLeague):
+    """
+    sleeper_wrapper League built from already fetched league data.
+
+    The wrapper's constructor requests the league synchronously; this subclass skips
+    that call so the mapping and standings helpers can be reused on data fetched by
+    `AsyncSleeperClient`.
+    """
+
+    def __init__(self, league_id, league):
+        self.league_id = league_id
+        self._base_url = f"{SLEEPER_API_URL}/league/{league_id}"
+        self._league = league
+
+
+class AsyncSleeperClient:
+    """
+    asyncio Sleeper API client backed by a pooled httpx.AsyncClient.
+
+    Use as an async context manager so the connection pool is closed afterwards:
+
+        async with AsyncSleeperClient() as client:
+            week_data = await client.fetch_league_week(league_id, week)
+    """
+
+    def __init__(self, client=None):
+        self._client = client or httpx.AsyncClient(
+            base_url=SLEEPER_API_URL,
+            timeout=SLEEPER_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=SLEEPER_MAX_CONNECTIONS),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def get(self, path):
+        response = await self._client.get(path)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_league_week(self, league_id, week, players_loader=None):
+        """
+        Fetches the league, rosters, users and a week's matchups concurrently.
+
+        Args:
+        - league_id (str): The Sleeper league ID.
+        - week (int): The week whose matchups to fetch.
+        - players_loader (Callable): Optional blocking players loader run alongside the
+          requests in a worker thread.
+
+        Returns:
+        - dict: 'league' (PrefetchedLeague), 'rosters', 'users', 'matchups' and, when a
+          loader is given, 'players_data'.
+        """
+        fetches = [
+            self.get(f"/league/{league_id}"),
+            self.get(f"/league/{league_id}/rosters"),
+            self.get(f"/league/{league_id}/users"),
+            self.get(f"/league/{league_id}/matchups/{week}"),
+        ]
+        if players_loader is not None:
+            fetches.append(asyncio.to_thread(players_loader))
+        league, rosters, users, matchups, *players = await asyncio.gather(*fetches)
+        week_data = {
+            'league': PrefetchedLeague(league_id, league),
+            'rosters': rosters,
+            'users': users,
+            'matchups': matchups,
+        }
+        if players:
+            week_data['players_data'] = players[0]
+        return week_data
+
+    async def fetch_league_weeks(self, league_id, weeks, players_loader=None):
+        """
+        Fetches the league, rosters, users and the matchups of several weeks concurrently.
+
+        Concurrency is bounded by the client's connection pool.
+
+        Args:
+        - league_id (str): The Sleeper league ID.
+        - weeks (Iterable[int]): The weeks whose matchups to fetch.
+        - players_loader (Callable): Optional blocking players loader run alongside the
+          requests in a worker thread.
+
+        Returns:
+        - dict: Same keys as `fetch_league_week`, with 'matchups' replaced by
+          'matchups_by_week' mapping each week to its matchups.
+        """
+        weeks = list(weeks)
+        fetches = [
+            self.get(f"/league/{league_id}"),
+            self.get(f"/league/{league_id}/rosters"),
+            self.get(f"/league/{league_id}/users"),
+        ] + [self.get(f"/league/{league_id}/matchups/{week}") for week in weeks]
+        if players_loader is not None:
+            fetches.append(asyncio.to_thread(players_loader))
+        results = await asyncio.gather(*fetches)
+        league, rosters, users = results[:3]
+        season_data = {
+            'league': PrefetchedLeague(league_id, league),
+            'rosters': rosters,
+            'users': users,
+            'matchups_by_week': dict(zip(weeks, results[3:3 + len(weeks)])),
+        }
+        if players_loader is not None:
+            season_data['players_data'] = results[-1]
+        return season_data
+
+    async def fetch_matchups_by_week(self, league_id, weeks):
+        """
+        Fetches the matchups of several weeks concurrently, for callers that already
+        have the league, rosters and users.
+
+        Returns:
+        - dict: Each week mapped to its matchups.
+        """
+        weeks = list(weeks)
+        matchups = await asyncio.gather(*(self.get(f"/league/{league_id}/matchups/{week}") for week in weeks))
+        return dict(zip(weeks, matchups))
+
+
+async def fetch_league_week_async(league_id, week, players_loader=None):
+    async with AsyncSleeperClient() as client:
+        return await client.fetch_league_week(league_id, week, players_loader)
+
+
+def run_to_completion(coro):
+    """
+    Runs a coroutine to completion from synchronous code such as a Streamlit script.
+
+    Falls back to a worker thread when the calling thread already has a running loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+def fetch_league_week(league_id, week, players_loader=None):
+    return run_to_completion(fetch_league_week_async(league_id, week, players_loader))
+
+
+async def fetch_league_weeks_async(league_id, weeks, players_loader=None):
+    async with AsyncSleeperClient() as client:
+        return await client.fetch_league_weeks(league_id, weeks, players_loader)
+
+
+def fetch_league_weeks(league_id, weeks, players_loader=None):
+    return run_to_completion(fetch_league_weeks_async(league_id, weeks, players_loader))
+
+
+async def fetch_matchups_by_week_async(league_id, weeks):
+    async with AsyncSleeperClient() as client:
+        return await client.fetch_matchups_by_week(league_id, weeks)
+
+
+def fetch_matchups_by_week(league_id, weeks):
+    return run_to_completion(fetch_matchups_by_week_async(league_id, weeks))
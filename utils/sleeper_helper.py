@@ -1,166 +1,158 @@
 from sleeper_wrapper import League
+from utils.player_store import open_player_store, parse_slim_players, DEFAULT_STORE_PATH, DEFAULT_SLIM_PATH
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import os
+import threading
 import requests
 
+# Process-wide cache of remote players data, keyed by URL
+_PLAYERS_CACHE = {}
+_PLAYERS_CACHE_LOCK = threading.Lock()
+# Revalidate at least this often even between weekly updates (a 304 is cheap)
+PLAYERS_MAX_AGE = timedelta(hours=1)
+PLAYERS_REQUEST_TIMEOUT = 10
+
+
+class LeagueIndex:
+    """
+    Precomputed lookups between rosters, owners and team names for one league and week.
+
+    Built once per recap from the league's rosters and users so every lookup is a dict
+    access instead of a scan over all rosters and users.
+    """
+
+    def __init__(self, rosters, users):
+        self.roster_to_owner = {roster['roster_id']: roster.get('owner_id') for roster in rosters}
+        self.owner_to_team_name = {}
+        for user in users:
+            user_id = user['user_id']
+            # Same precedence as sleeper_wrapper's map_users_to_team_name
+            try:
+                self.owner_to_team_name[user_id] = user['metadata']['team_name']
+            except (KeyError, TypeError):
+                self.owner_to_team_name[user_id] = user.get('display_name')
+
+    @property
+    def user_team_mapping(self):
+        return self.owner_to_team_name
+
+    @property
+    def roster_owner_mapping(self):
+        return self.roster_to_owner
+
+    def team_name_for_roster(self, roster_id):
+        return self.owner_to_team_name.get(self.roster_to_owner.get(roster_id), "Unknown Team")
+
+
+# Indexes are cached per (league, week); completed weeks never change
+_LEAGUE_INDEX_CACHE = OrderedDict()
+_LEAGUE_INDEX_CACHE_SIZE = 64
+_LEAGUE_INDEX_LOCK = threading.Lock()
+
+def get_league_index(league_id, week, rosters, users):
+    key = (str(league_id), week)
+    with _LEAGUE_INDEX_LOCK:
+        if key in _LEAGUE_INDEX_CACHE:
+            _LEAGUE_INDEX_CACHE.move_to_end(key)
+            return _LEAGUE_INDEX_CACHE[key]
+    index = LeagueIndex(rosters, users)
+    with _LEAGUE_INDEX_LOCK:
+        _LEAGUE_INDEX_CACHE[key] = index
+        while len(_LEAGUE_INDEX_CACHE) > _LEAGUE_INDEX_CACHE_SIZE:
+            _LEAGUE_INDEX_CACHE.popitem(last=False)
+    return index
 
-def map_player_to_team(player_id, rosters, users):
-    for roster in rosters:
-        if player_id in roster['players']:
-            owner_id = roster['owner_id']
-            for user in users:
-                if user['user_id'] == owner_id:
-                    return user['display_name']
-    return "Unknown Team"
-
-def map_roster_to_team(roster_id, rosters, users):
-    for roster in rosters:
-        if roster['roster_id'] == roster_id:
-            owner_id = roster['owner_id']
-            for user in users:
-                if user['user_id'] == owner_id:
-                    return user['display_name']
-    return "Unknown Team"
-
-def highest_scoring_team_of_week(scoreboards):
-    highest_score = -1
-    highest_scoring_team = None
-    
-    for matchup, teams in scoreboards.items():
-        for team_name, score in teams:
-            if score > highest_score:
-                highest_score = score
-                highest_scoring_team = team_name
-                
-    return highest_scoring_team, highest_score
 
 def top_3_teams(standings):
     top_3 = sorted(standings, key=lambda x: (-int(x[1]), -int(x[2]), -int(x[3])))[:3]
     return [(team, wins, losses, points) for team, wins, losses, points in top_3]
 
 
-def load_player_data(url):
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()
-    else:
+def next_players_update(after):
+    # The players data workflow runs every Tuesday at 08:00 UTC
+    update = after.replace(hour=8, minute=0, second=0, microsecond=0) + timedelta(days=(1 - after.weekday()) % 7)
+    if update <= after:
+        update += timedelta(days=7)
+    return update
+
+
+def _players_expiry(now):
+    return min(next_players_update(now), now + PLAYERS_MAX_AGE)
+
+
+def _fetch_remote_players(url, parse, entry=None):
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    response = requests.get(url, headers=headers, timeout=PLAYERS_REQUEST_TIMEOUT)
+    now = datetime.now(timezone.utc)
+    if response.status_code == 304 and entry is not None:
+        return dict(entry, expires_at=_players_expiry(now), refreshing=False)
+    response.raise_for_status()
+    return {
+        'data': parse(response),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'expires_at': _players_expiry(now),
+        'refreshing': False,
+    }
+
+
+def _refresh_remote_players(url, parse, entry):
+    try:
+        refreshed = _fetch_remote_players(url, parse, entry)
+    except Exception as e:
+        # Keep serving the last good copy and retry after the next max-age window
+        print(f"Warning: could not revalidate players data from {url}: {e}")
+        refreshed = dict(entry, expires_at=datetime.now(timezone.utc) + PLAYERS_MAX_AGE, refreshing=False)
+    with _PLAYERS_CACHE_LOCK:
+        _PLAYERS_CACHE[url] = refreshed
+
+
+def _load_cached_remote_players(url, parse):
+    # Serve from memory while fresh; once stale, serve the cached copy and revalidate
+    # it in the background with If-None-Match/If-Modified-Since
+    with _PLAYERS_CACHE_LOCK:
+        entry = _PLAYERS_CACHE.get(url)
+        if entry is not None:
+            if entry['expires_at'] <= datetime.now(timezone.utc) and not entry['refreshing']:
+                entry['refreshing'] = True
+                threading.Thread(target=_refresh_remote_players, args=(url, parse, dict(entry)), daemon=True).start()
+            return entry['data']
+    try:
+        entry = _fetch_remote_players(url, parse)
+    except Exception as e:
+        print(f"Warning: could not load players data from {url}: {e}")
         return None
+    with _PLAYERS_CACHE_LOCK:
+        _PLAYERS_CACHE[url] = entry
+    return entry['data']
 
 
-def highest_scoring_player_of_week(matchups, players_data, user_team_mapping, roster_owner_mapping):
-    highest_score = -1
-    highest_scoring_player = None
-    highest_scoring_player_team = "Unknown Team"
-    
-    for matchup in matchups:
-        print(f"Debug Matchup: {matchup}")  # Log the matchup structure
-        roster_id = matchup['roster_id']
-        owner_id = roster_owner_mapping.get(roster_id)
-        team_name = user_team_mapping.get(owner_id, "Unknown Team")
-        
-        for player_id, score in matchup.get('players_points', {}).items():
-            if score > highest_score:
-                highest_score = score
-                highest_scoring_player = player_id
-                highest_scoring_player_team = team_name
-                
-    if highest_scoring_player and highest_scoring_player in players_data:
-        player_name = players_data[highest_scoring_player].get('full_name', 'Unknown Player')
-        return player_name, highest_score, highest_scoring_player_team
-    else:
-        return None, None, "Unknown Team"
-
-def lowest_scoring_starter_of_week(matchups, players_data, user_team_mapping, roster_owner_mapping):
-    lowest_score = float('inf')  # Initialize with a high score to compare
-    lowest_scoring_player = None
-    lowest_scoring_player_team = "Unknown Team"
-    
-    for matchup in matchups:
-        # Ensure matchup contains 'roster_id' and it's valid
-        roster_id = matchup.get('roster_id')
-        if roster_id is None:
-            continue  # Skip this matchup if 'roster_id' is missing
-        
-        owner_id = roster_owner_mapping.get(roster_id)
-        team_name = user_team_mapping.get(owner_id, "Unknown Team")
-        
-        # Ensure 'starters' exists and is not None
-        if 'starters' in matchup and matchup['starters']:
-            for player_id in matchup['starters']:
-                # Get player score or default to 0 if not found
-                score = matchup.get('players_points', {}).get(player_id, 0)
-                if score < lowest_score:
-                    lowest_score = score
-                    lowest_scoring_player = player_id
-                    lowest_scoring_player_team = team_name
-        else:
-            # Log or handle missing starters
-            print(f"Warning: 'starters' not found or None in matchup: {matchup}")
-    
-    # After checking all matchups, return the result
-    if lowest_scoring_player and lowest_scoring_player in players_data:
-        player_name = players_data[lowest_scoring_player].get('full_name', 'Unknown Player')
-        return player_name, lowest_score, lowest_scoring_player_team
-    else:
-        return None, None, "Unknown Team"
-
+def load_player_data(url):
+    return _load_cached_remote_players(url, lambda response: response.json())
 
 
-def highest_scoring_benched_player_of_week(matchups, players_data, user_team_mapping, roster_owner_mapping):
-    highest_score = float('-inf')  # Initialize with a low score
-    highest_scoring_player = None
-    highest_scoring_player_team = "Unknown Team"
-    
-    for matchup in matchups:
-        roster_id = matchup.get('roster_id')
-        if roster_id is None:
-            continue  # Skip if 'roster_id' is missing
-        
-        owner_id = roster_owner_mapping.get(roster_id)
-        team_name = user_team_mapping.get(owner_id, "Unknown Team")
-        
-        # Ensure 'starters' exists and is not None
-        starters = matchup.get('starters')
-        if starters is None:
-            print(f"Warning: 'starters' is None in matchup: {matchup}")
-            continue  # Skip this matchup if starters is missing
-        
-        # Check benched players by iterating over all players
-        for player_id, score in matchup.get('players_points', {}).items():
-            if player_id not in starters and score > highest_score:
-                highest_score = score
-                highest_scoring_player = player_id
-                highest_scoring_player_team = team_name
-    
-    if highest_scoring_player and highest_scoring_player in players_data:
-        player_name = players_data[highest_scoring_player].get('full_name', 'Unknown Player')
-        return player_name, highest_score, highest_scoring_player_team
-    else:
-        return None, None, "Unknown Team"
+def load_slim_player_data(url):
+    return _load_cached_remote_players(url, lambda response: parse_slim_players(response.content)[1])
 
 
-    
-def biggest_blowout_match_of_week(scoreboards):
-    biggest_blowout = -1
-    biggest_blowout_match = None
-    
-    for matchup, teams in scoreboards.items():
-        point_diff = abs(teams[0][1] - teams[1][1])
-        if point_diff > biggest_blowout:
-            biggest_blowout = point_diff
-            biggest_blowout_match = (teams[0], teams[1])
-            
-    return biggest_blowout_match, biggest_blowout
+def load_player_store(url, store_path=DEFAULT_STORE_PATH, slim_path=DEFAULT_SLIM_PATH):
+    # Prefer the local players index built by data/fetch_players.py (rebuilt from the
+    # slim artifact when its content hash changed) and only go to the network when
+    # neither has been built. The slim artifact is tried before the full players dump.
+    store = open_player_store(store_path, slim_path)
+    if store is not None:
+        return store
+    print(f"Warning: players store not found at {store_path}, downloading players data")
+    slim_url = url.replace("players_data.json", os.path.basename(slim_path))
+    players = load_slim_player_data(slim_url)
+    return players if players is not None else load_player_data(url)
 
-def closest_match_of_week(scoreboards):
-    smallest_margin = float('inf')
-    closest_match = None
-    
-    for matchup, teams in scoreboards.items():
-        point_diff = abs(teams[0][1] - teams[1][1])
-        if point_diff < smallest_margin:
-            smallest_margin = point_diff
-            closest_match = (teams[0], teams[1])
-            
-    return closest_match, smallest_margin
 
 def team_with_most_moves(rosters, user_team_mapping, roster_owner_mapping):
     most_moves = -1
@@ -197,29 +189,3 @@ def team_on_hottest_streak(rosters, user_team_mapping, roster_owner_mapping):
             
     return team_on_hottest_streak, longest_streak
 
-
-def calculate_scoreboards(matchups, user_team_mapping, roster_owner_mapping):
-    matchups_dict = {}
-    for matchup in matchups:
-        # Log the full matchup structure for debugging
-        print(f"Debug Matchup: {matchup}")
-        
-        roster_id = matchup.get('roster_id')
-        owner_id = roster_owner_mapping.get(roster_id)
-        team_name = user_team_mapping.get(owner_id, "Unknown Team")
-        total_points = matchup.get('points', 0)  # Check if points exist
-        matchup_id = matchup.get('matchup_id')
-        
-        if matchup_id not in matchups_dict:
-            matchups_dict[matchup_id] = []
-        matchups_dict[matchup_id].append((team_name, total_points))
-    
-    # Sort the matchups by total points in descending order
-    for key in matchups_dict:
-        matchups_dict[key] = sorted(matchups_dict[key], key=lambda x: -x[1])
-    
-    return matchups_dict
-
-
-
-
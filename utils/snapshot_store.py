@@ -0,0 +1,99 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from streamlit.logger import get_logger
+
+LOGGER = get_logger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SNAPSHOT_PATH = os.environ.get(
+    "COMMISH_SNAPSHOT_DB", os.path.join(ROOT_DIR, ".cache", "snapshots.sqlite")
+)
+# How long a snapshot of a week that is not final yet may be served
+IN_PROGRESS_TTL = 3600
+
+
+class SnapshotStore:
+    """
+    Disk-backed store of compressed per-week snapshots keyed by (platform, league, year, week, kind).
+
+    ESPN and Yahoo keep the same league id from one season to the next, so the season
+    year is part of the key.
+
+    Final fantasy weeks never change, so snapshots written with `immutable=True` are
+    served forever without any upstream call. Snapshots of a week that can still change,
+    in progress or awaiting stat corrections, expire after `IN_PROGRESS_TTL` seconds
+    and are refetched.
+
+    Payloads are pickled and zlib-compressed. Store errors are logged and treated as
+    cache misses so a broken cache never breaks a recap.
+
+    Args:
+    - path (str): Path of the SQLite database, created if missing.
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " platform TEXT NOT NULL, league_id TEXT NOT NULL, year INTEGER NOT NULL, week INTEGER NOT NULL,"
+                " kind TEXT NOT NULL, immutable INTEGER NOT NULL, created_at REAL NOT NULL, payload BLOB NOT NULL,"
+                " PRIMARY KEY (platform, league_id, year, week, kind))"
+            )
+            self._conn.commit()
+
+    def get(self, platform, league_id, year, week, kind="summary", max_age=IN_PROGRESS_TTL):
+        """
+        Returns the snapshot payload, or None when missing or an expired in-progress week.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT immutable, created_at, payload FROM snapshots"
+                    " WHERE platform = ? AND league_id = ? AND year = ? AND week = ? AND kind = ?",
+                    (platform, str(league_id), int(year), week, kind),
+                ).fetchone()
+            if row is None:
+                return None
+            immutable, created_at, payload = row
+            if not immutable and time.time() - created_at > max_age:
+                return None
+            return pickle.loads(zlib.decompress(payload))
+        except Exception:
+            LOGGER.exception(f"Failed to read {platform} snapshot for league {league_id} {year} week {week}")
+            return None
+
+    def put(self, platform, league_id, year, week, payload, immutable, kind="summary"):
+        """
+        Stores a snapshot; `immutable` marks a completed week that is never refetched.
+        """
+        try:
+            blob = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (platform, str(league_id), int(year), week, kind, int(bool(immutable)), time.time(), blob),
+                )
+                self._conn.commit()
+        except Exception:
+            LOGGER.exception(f"Failed to write {platform} snapshot for league {league_id} {year} week {week}")
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+def get_snapshot_store():
+    # One store per process, shared by every Streamlit session
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SnapshotStore()
+        return _STORE
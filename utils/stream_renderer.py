@@ -0,0 +1,63 @@
+import time
+
+# Re-render at most this often while a recap is streaming...
+DEFAULT_MIN_INTERVAL_MS = 100
+# ...unless this many chunks have arrived since the last frame
+DEFAULT_MAX_PENDING_CHUNKS = 25
+CURSOR = "▌"
+
+
+class StreamRenderer:
+    """
+    Throttled markdown renderer for a streaming recap.
+
+    Chunks are collected in a list and joined only when a frame is rendered, and the
+    placeholder is re-rendered at most every `min_interval_ms` milliseconds or every
+    `max_pending_chunks` chunks, instead of once per token.
+
+    Args:
+    - placeholder: Streamlit element returned by `st.empty()`.
+    - min_interval_ms (int): Minimum time between frames.
+    - max_pending_chunks (int): Chunks after which a frame is rendered regardless of time.
+    """
+
+    def __init__(self, placeholder, min_interval_ms=DEFAULT_MIN_INTERVAL_MS, max_pending_chunks=DEFAULT_MAX_PENDING_CHUNKS):
+        self.placeholder = placeholder
+        self.min_interval = min_interval_ms / 1000
+        self.max_pending_chunks = max_pending_chunks
+        self._chunks = []
+        self._pending = 0
+        self._last_frame = None
+        self.frames = 0
+        self.render_seconds = 0.0
+
+    @property
+    def text(self):
+        return "".join(self._chunks)
+
+    def append(self, chunk):
+        self._chunks.append(chunk)
+        self._pending += 1
+        now = time.perf_counter()
+        if self._last_frame is None or self._pending >= self.max_pending_chunks or now - self._last_frame >= self.min_interval:
+            self._render(CURSOR)
+
+    def finish(self):
+        """
+        Renders the final frame without the cursor and returns the full text.
+        """
+        return self._render("")
+
+    def _render(self, suffix):
+        start = time.perf_counter()
+        text = self.text
+        self.placeholder.markdown(text + suffix)
+        end = time.perf_counter()
+        self.frames += 1
+        self.render_seconds += end - start
+        self._last_frame = end
+        self._pending = 0
+        return text
+
+    def stats(self):
+        return {"chunks": len(self._chunks), "frames": self.frames, "render_seconds": round(self.render_seconds, 4)}
@@ -0,0 +1,83 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# Default memory budget for cached league summaries
+DEFAULT_MAX_BYTES = int(os.environ.get("COMMISH_SUMMARY_CACHE_BYTES", 32 * 1024 * 1024))
+
+
+class SummaryCache:
+    """
+    Bounded in-memory LRU cache of league summaries keyed by (platform, league, year, week).
+
+    Entries are weighed by their pickled size and the least recently used ones are
+    evicted once `max_bytes` is exceeded. Entries put with a `ttl` expire after that
+    many seconds, so weeks that are not final yet are refreshed. Keys deliberately
+    exclude credentials and auth paths; callers must only consult the cache after the
+    platform has accepted the caller's credentials for the league.
+
+    Args:
+    - max_bytes (int): Memory budget for cached values.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(platform, league_id, year, week):
+        return (platform.lower(), str(league_id).strip(), int(year), int(week))
+
+    def get(self, platform, league_id, year, week):
+        key = self.key(platform, league_id, year, week)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and time.time() > entry[2]:
+                self._bytes -= self._entries.pop(key)[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, platform, league_id, year, week, value, ttl=None):
+        key = self.key(platform, league_id, year, week)
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, None if ttl is None else time.time() + ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Returns the cache counters and current footprint.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Shared by every Streamlit session in the process
+SUMMARY_CACHE = SummaryCache()
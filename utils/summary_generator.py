@@ -2,12 +2,23 @@
 
 from espn_api.football import League
 from yfpy.query import YahooFantasySportsQuery
-from sleeper_wrapper import League as SleeperLeague
-from utils import espn_helper, yahoo_helper, sleeper_helper, helper
+from utils import espn_helper, yahoo_helper, sleeper_helper, sleeper_client, helper
+from utils.snapshot_store import IN_PROGRESS_TTL, get_snapshot_store
+from utils.summary_cache import SUMMARY_CACHE
+from utils.recap_cache import get_recap_cache, recap_key, replay_chunks
+from utils.llm_metrics import LLM_METRICS
+from utils.llm_stream import HEDGE_AFTER_SECONDS, HEDGE_FALLBACK_MODEL, stream_completion
+from utils.week_model import league_week_from_sleeper
+from utils.week_stats import compute_week_stats
+from utils.season_stats import update_season
+from utils.power_rankings import format_luck, format_power_rankings, power_rankings, week_scores_from_league_week
+from utils.season_review import build_season_summary, fetch_weeks_concurrently, gather_season
 import openai  # Update: Use openai package directly
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import datetime  # Fix: Missing import
-import streamlit as st
 from streamlit.logger import get_logger
 
 LOGGER = get_logger(__name__)
@@ -29,53 +40,175 @@ def moderate_text(text):
 
 LOGGER = logging.getLogger(__name__)
 
-def generate_gpt4_summary_streaming(summary, character_choice, trash_talk_level):
+def build_recap_messages(summary, character_choice, trash_talk_level, season_review=False):
     # Construct the instruction for GPT-4 based on user inputs
-    instruction = f"You will be provided a summary below containing the most recent weekly stats for a fantasy football league. \
+    if season_review:
+        instruction = f"You will be provided a summary below containing the season to date stats for a fantasy football league. \
+    Create a season in review recap in the style of {character_choice}. You should include trash talk with a level of {trash_talk_level}. \
+    Here is the provided season fantasy summary: {summary}"
+    else:
+        instruction = f"You will be provided a summary below containing the most recent weekly stats for a fantasy football league. \
     Create a weekly recap in the style of {character_choice}. You should include trash talk with a level of {trash_talk_level}. \
     Here is the provided weekly fantasy summary: {summary}"
 
-    messages = [
+    return [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": instruction}
     ]
 
+def generate_gpt4_summary_streaming(summary, character_choice, trash_talk_level, model="gpt-4",
+                                    hedge_after=HEDGE_AFTER_SECONDS, fallback_model=HEDGE_FALLBACK_MODEL, client=None,
+                                    season_review=False):
+    """
+    Streams a recap of the league summary in the style of the given character.
+
+    With `hedge_after` set, a backup request to `fallback_model` (or the same model) is
+    started when no first token arrives within that many seconds, and whichever request
+    starts first is streamed. `client` defaults to the module level `openai` client.
+    `season_review` asks for a season in review instead of a weekly recap.
+    """
+    # Identical summary, persona, trash level and model replay the cached recap
+    recap_cache = get_recap_cache()
+    cached_recap = recap_cache.get(recap_key(summary, character_choice, trash_talk_level, model))
+    if cached_recap is not None:
+        LOGGER.info("Replaying cached recap")
+        LLM_METRICS.record_cache_hit(model)
+        yield from replay_chunks(cached_recap)
+        return
+
+    messages = build_recap_messages(summary, character_choice, trash_talk_level, season_review)
+
     try:
-        # Correct API call for chat-based models in OpenAI v1.0.0+
-        response = openai.chat.completions.create(
-            model="gpt-4",  # Ensure correct chat model is used
-            messages=messages,
-            max_tokens=800,  # Control response length
-            stream=True  # Enable streaming
-        )
-
-        # Processing the stream response
-        for chunk in response:
-            # Log the chunk to inspect its structure
-            LOGGER.debug(f"Received chunk: {chunk}")
-
-            # Access the content directly without using `.get()`
-            content = chunk.choices[0].delta.content
-
-            # Skip empty chunks
-            if not content:
-                continue  # Wait for actual content
-            
-            # Yield the content if it's available
+        recap_chunks = []
+        for _, content in stream_completion(client or openai, messages, model, hedge_after, fallback_model):
+            recap_chunks.append(content)
             yield content
 
+        # Only complete recaps are cached. They are keyed by the requested model, like the
+        # lookup above, so a recap the hedged fallback won is replayed on the next request
+        if recap_chunks:
+            recap_cache.put(recap_key(summary, character_choice, trash_talk_level, model), "".join(recap_chunks))
+
     except Exception as e:
         LOGGER.error(f"Error while generating GPT-4 summary: {str(e)}")
         return "Failed to get response from GPT-4"
+
+# Maximum number of persona recaps generated at the same time
+MULTI_PERSONA_CONCURRENCY = 3
+
+def _stream_persona_recap(emit, index, summary, character_choice, trash_talk_level, model, season_review):
+    # Same path as a single recap: recap cache, first token hedging and metrics
+    for content in generate_gpt4_summary_streaming(summary, character_choice, trash_talk_level, model=model, season_review=season_review):
+        emit(index, content)
+
+def generate_multi_persona_summaries_streaming(summary, personas, model="gpt-4", max_concurrency=MULTI_PERSONA_CONCURRENCY, season_review=False):
+    """
+    Streams recaps of one league summary for several personas concurrently.
+    
+    Args:
+    - summary (str): The league summary.
+    - personas (List[Tuple[str, int]]): (character description, trash talk level) pairs.
+    - model (str): The chat model.
+    - max_concurrency (int): Maximum number of completions in flight at once.
+    - season_review (bool): Ask for season in review recaps instead of weekly ones.
+    
+    Yields:
+    - Tuple(int, str): Index into `personas` and the next chunk of that persona's recap,
+      interleaved in arrival order.
+    """
+    events = queue.Queue()
+    done = object()
+
+    def emit(index, content):
+        events.put((index, content))
+
+    def run():
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(personas)))) as executor:
+                futures = [
+                    executor.submit(_stream_persona_recap, emit, index, summary, character_choice, trash_talk_level, model, season_review)
+                    for index, (character_choice, trash_talk_level) in enumerate(personas)
+                ]
+                for future in futures:
+                    future.result()
+        except Exception as e:
+            LOGGER.error(f"Error while generating persona recaps: {str(e)}")
+        finally:
+            events.put(done)
+
+    # The completions run on worker threads so Streamlit's script thread can render
+    # chunks as they arrive
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        event = events.get()
+        if event is done:
+            return
+        yield event
         
-@st.cache_data(ttl=3600)
+def lookup_week_summary(platform, league_id, year, week, kind="summary"):
+    # Memory cache first, then the on-disk snapshot store (promoted into memory). Promoted
+    # entries expire like in-progress snapshots so a week that is not final yet is rechecked
+    cache_platform = platform if kind == "summary" else f"{platform}:{kind}"
+    summary = SUMMARY_CACHE.get(cache_platform, league_id, year, week)
+    if summary is None:
+        summary = get_snapshot_store().get(platform, league_id, year, week, kind=kind)
+        if summary is not None:
+            SUMMARY_CACHE.put(cache_platform, league_id, year, week, summary, ttl=IN_PROGRESS_TTL)
+    LOGGER.info(f"Summary cache stats: {SUMMARY_CACHE.stats()}")
+    return summary
+
+def store_week_summary(platform, league_id, year, week, summary, immutable, league_week=None):
+    SUMMARY_CACHE.put(platform, league_id, year, week, summary, ttl=None if immutable else IN_PROGRESS_TTL)
+    get_snapshot_store().put(platform, league_id, year, week, summary, immutable=immutable)
+    # The normalized week is kept too so season level features can reuse it
+    if league_week is not None:
+        get_snapshot_store().put(platform, league_id, year, week, league_week, immutable=immutable, kind="league_week")
+
+def sleeper_week_fetcher(league_id, week, index=None, players_data=None):
+    """
+    Returns a `fetch_weeks` callable for Sleeper that fetches several weeks of a league at once.
+
+    A weekly recap passes the league index and players it already loaded, so only the
+    weeks' matchups are requested.
+    """
+    players_url = "https://raw.githubusercontent.com/jeisey/commish/main/players_data.json"
+
+    def fetch_weeks(weeks):
+        if index is not None and players_data is not None:
+            week_index, week_players = index, players_data
+            matchups_by_week = sleeper_client.fetch_matchups_by_week(league_id, weeks)
+        else:
+            # One pooled client fetches the shared league data and every missing week's matchups together
+            season_data = sleeper_client.fetch_league_weeks(
+                league_id, weeks, players_loader=lambda: sleeper_helper.load_player_store(players_url)
+            )
+            week_index = sleeper_helper.get_league_index(league_id, week, season_data['rosters'], season_data['users'])
+            week_players = season_data['players_data']
+            matchups_by_week = season_data['matchups_by_week']
+        return {
+            missing_week: league_week_from_sleeper(matchups, week_index, week_players, league_id, missing_week)
+            for missing_week, matchups in matchups_by_week.items()
+        }
+
+    return fetch_weeks
+
 def generate_sleeper_summary(league_id):
-    league = SleeperLeague(league_id)
     current_date_today = datetime.datetime.now()  # Fix: datetime was not imported
     week = helper.get_current_week(current_date_today) - 1  # Force to always be the most recent completed week
-    rosters = league.get_rosters()
-    users = league.get_users()
-    matchups = league.get_matchups(week)
+    year = helper.get_nfl_season(current_date_today)
+    # Cached weeks are served without any Sleeper request
+    summary = lookup_week_summary("sleeper", league_id, year, week)
+    if summary is not None:
+        return summary
+    players_url = "https://raw.githubusercontent.com/jeisey/commish/main/players_data.json"
+    # League, rosters, users, matchups and players are independent, fetch them concurrently
+    week_data = sleeper_client.fetch_league_week(
+        league_id, week, players_loader=lambda: sleeper_helper.load_player_store(players_url)
+    )
+    league = week_data['league']
+    rosters = week_data['rosters']
+    users = week_data['users']
+    matchups = week_data['matchups']
     print(f"Debug: Week {week} Matchups: {matchups}")  # Log matchups to inspect response
     standings = league.get_standings(rosters, users)
 
@@ -84,37 +217,55 @@ def generate_sleeper_summary(league_id):
         print(f"Warning: No matchups data for week {week}.")
         return "No matchups available."
     
-    players_url = "https://raw.githubusercontent.com/jeisey/commish/main/players_data.json"
-    players_data = sleeper_helper.load_player_data(players_url)
+    players_data = week_data['players_data']
 
-    user_team_mapping = league.map_users_to_team_name(users)
-    roster_owner_mapping = league.map_rosterid_to_ownerid(rosters)
+    index = sleeper_helper.get_league_index(league_id, week, rosters, users)
+    user_team_mapping = index.user_team_mapping
+    roster_owner_mapping = index.roster_owner_mapping
 
-    scoreboards = sleeper_helper.calculate_scoreboards(matchups, user_team_mapping, roster_owner_mapping)
+    league_week = league_week_from_sleeper(matchups, index, players_data, league_id, week)
+    stats = compute_week_stats(league_week)
 
-    highest_scoring_team_name, highest_scoring_team_score = sleeper_helper.highest_scoring_team_of_week(scoreboards)
+    top_team = stats['highest_scoring_team']
     top_3_teams_result = sleeper_helper.top_3_teams(standings)
-    highest_scoring_player_week, weekly_score, highest_scoring_player_team_week = sleeper_helper.highest_scoring_player_of_week(matchups, players_data, user_team_mapping, roster_owner_mapping)
-    lowest_scoring_starter, lowest_starter_score, lowest_scoring_starter_team = sleeper_helper.lowest_scoring_starter_of_week(matchups, players_data, user_team_mapping, roster_owner_mapping)
-    highest_scoring_benched_player, highest_benched_score, highest_scoring_benched_player_team = sleeper_helper.highest_scoring_benched_player_of_week(matchups, players_data, user_team_mapping, roster_owner_mapping)
-    blowout_teams, point_differential_blowout = sleeper_helper.biggest_blowout_match_of_week(scoreboards)
-    close_teams, point_differential_close = sleeper_helper.closest_match_of_week(scoreboards)
-    hottest_streak_team, longest_streak = sleeper_helper.team_on_hottest_streak(rosters, user_team_mapping, roster_owner_mapping)
+    top_player, top_player_team = stats['top_scorer']
+    lowest_starter, lowest_starter_team = stats['lowest_starter']
+    blowout_winner, blowout_loser, point_differential_blowout = stats['biggest_blowout']
+    close_winner, close_loser, point_differential_close = stats['closest_game']
+    season = update_season(
+        "sleeper", league_id, year, league_week, helper.get_current_week(current_date_today),
+        sleeper_week_fetcher(league_id, week, index, players_data),
+    )
+    if season.covers(week):
+        hottest_streak_team, longest_streak = season.hottest_streak()
+        luck_lines = "".join(f"\n{line}" for line in format_luck(season.luck()))
+    else:
+        hottest_streak_team, longest_streak = sleeper_helper.team_on_hottest_streak(rosters, user_team_mapping, roster_owner_mapping)
+        luck_lines = ""
+    week_rankings = format_power_rankings(power_rankings([week_scores_from_league_week(league_week)]), weekly=True)
+    if stats['highest_benched'] is not None:
+        benched_player, benched_player_team = stats['highest_benched']
+        highest_benched_line = f"Highest scoring benched player of the week: {benched_player.name} with {benched_player.points} points (Team: {benched_player_team.name})\n"
+    else:
+        highest_benched_line = ""
 
     summary = (
-        f"The highest scoring team of the week: {highest_scoring_team_name} with {round(highest_scoring_team_score, 2)} points\n"
+        f"The highest scoring team of the week: {top_team.name} with {round(top_team.points, 2)} points\n"
         f"Standings; Top 3 Teams:\n"
         f"  1. {top_3_teams_result[0][0]} - {top_3_teams_result[0][3]} points ({top_3_teams_result[0][1]}W-{top_3_teams_result[0][2]}L)\n"
         f"  2. {top_3_teams_result[1][0]} - {top_3_teams_result[1][3]} points ({top_3_teams_result[1][1]}W-{top_3_teams_result[1][2]}L)\n"
         f"  3. {top_3_teams_result[2][0]} - {top_3_teams_result[2][3]} points ({top_3_teams_result[2][1]}W-{top_3_teams_result[2][2]}L)\n"
-        f"Highest scoring player of the week: {highest_scoring_player_week} with {weekly_score} points (Team: {highest_scoring_player_team_week})\n"
-        f"Lowest scoring player of the week that started: {lowest_scoring_starter} with {lowest_starter_score} points (Team: {lowest_scoring_starter_team})\n"
-        f"Highest scoring benched player of the week: {highest_scoring_benched_player} with {highest_benched_score} points (Team: {highest_scoring_benched_player_team})\n"
-        f"Biggest blowout match of the week: {blowout_teams[0]} vs {blowout_teams[1]} (Point Differential: {round(point_differential_blowout, 2)})\n"
-        f"Closest match of the week: {close_teams[0]} vs {close_teams[1]} (Point Differential: {round(point_differential_close, 2)})\n"
-        f"Team on the hottest streak: {hottest_streak_team} with a {longest_streak} game win streak"
+        f"Highest scoring player of the week: {top_player.name} with {top_player.points} points (Team: {top_player_team.name})\n"
+        f"Lowest scoring player of the week that started: {lowest_starter.name} with {lowest_starter.points} points (Team: {lowest_starter_team.name})\n"
+        f"{highest_benched_line}"
+        f"Biggest blowout match of the week: {blowout_winner.name} ({blowout_winner.points}) vs {blowout_loser.name} ({blowout_loser.points}) (Point Differential: {round(point_differential_blowout, 2)})\n"
+        f"Closest match of the week: {close_winner.name} ({close_winner.points}) vs {close_loser.name} ({close_loser.points}) (Point Differential: {round(point_differential_close, 2)})\n"
+        f"Team on the hottest streak: {hottest_streak_team} with a {longest_streak} game win streak\n"
+        f"Power rankings (all-play record this week):\n{week_rankings}"
+        f"{luck_lines}"
     )
 
+    store_week_summary("sleeper", league_id, year, week, summary, immutable=helper.is_week_final(week, helper.get_current_week(current_date_today)), league_week=league_week)
     return summary
 
 
@@ -129,26 +280,52 @@ def generate_espn_summary(league, cw):
     Returns:
     - str: A human-friendly summary.
     """
+    # Fetch the independent ESPN views concurrently before computing stats
+    start_time = datetime.datetime.now()
+    espn_helper.fetch_week_data(league, cw)
+    print(f"Time for fetch_week_data: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
+    
     # Extracting required data using helper functions
     start_time = datetime.datetime.now()
     top_teams = espn_helper.top_three_teams(league)
     print(f"Time for top_three_teams: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
     
     start_time = datetime.datetime.now()
-    top_scorer_week = espn_helper.top_scorer_of_week(league, cw)
-    print(f"Time for top_scorer_of_week: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
-    
-    start_time = datetime.datetime.now()
-    worst_scorer_week = espn_helper.worst_scorer_of_week(league, cw)
-    print(f"Time for worst_scorer_of_week: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
+    # Served from the box scores fetched above when `league` is a CachedLeague
+    league_week = espn_helper.fetch_league_week(league, cw)
+    weekly_stats = compute_week_stats(league_week)
+    top_scorer_week = weekly_stats["top_scorer"]
+    worst_scorer_week = weekly_stats["worst_scorer"]
+    highest_bench = weekly_stats["highest_benched"]
+    lowest_start = weekly_stats["lowest_starter"]
+    biggest_blowout = weekly_stats["biggest_blowout"]
+    closest_game = weekly_stats["closest_game"]
+    top_scoring_team_week = weekly_stats["highest_scoring_team"]
+    print(f"Time for weekly_stats: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
     
     start_time = datetime.datetime.now()
-    top_scorer_szn = espn_helper.top_scorer_of_season(league)
-    print(f"Time for top_scorer_of_season: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
+    # Season totals add this week's delta; earlier weeks they are missing are fetched in the
+    # background for later recaps and this one uses the season totals ESPN keeps
+    season = update_season(
+        "espn", league.league_id, league.year, league_week, league.current_week,
+        lambda weeks: fetch_weeks_concurrently(lambda week: espn_helper.fetch_league_week(league, week), weeks),
+    )
+    if season.covers(cw):
+        top_scorer_szn = season.top_scorer()
+        worst_scorer_szn = season.worst_scorer()
+        luck_lines = format_luck(season.luck())
+    else:
+        luck_lines = []
+        top_player, top_points = espn_helper.top_scorer_of_season(league)
+        worst_player, worst_points = espn_helper.worst_scorer_of_season(league)
+        top_scorer_szn = (top_player.name, top_points)
+        worst_scorer_szn = (worst_player.name, worst_points)
+    print(f"Time for season scorers: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
     
     start_time = datetime.datetime.now()
-    worst_scorer_szn = espn_helper.worst_scorer_of_season(league)
-    print(f"Time for worst_scorer_of_season: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
+    # Ranks the week built from the box scores above, byes included, no extra ESPN call
+    week_rankings = format_power_rankings(power_rankings([week_scores_from_league_week(league_week)]), weekly=True)
+    print(f"Time for power_rankings: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
     
     start_time = datetime.datetime.now()
     most_trans = espn_helper.team_with_most_transactions(league)
@@ -158,45 +335,28 @@ def generate_espn_summary(league, cw):
     most_injured = espn_helper.team_with_most_injured_players(league)
     print(f"Time for team_with_most_injured_players: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
     
-    start_time = datetime.datetime.now()
-    highest_bench = espn_helper.highest_scoring_benched_player(league, cw)
-    print(f"Time for highest_scoring_benched_player: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
-    
-    start_time = datetime.datetime.now()
-    lowest_start = espn_helper.lowest_scoring_starting_player(league, cw)
-    print(f"Time for lowest_scoring_starting_player: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
-    
-    start_time = datetime.datetime.now()
-    biggest_blowout = espn_helper.biggest_blowout_match(league, cw)
-    print(f"Time for biggest_blowout_match: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
-    
-    start_time = datetime.datetime.now()
-    closest_game = espn_helper.closest_game_match(league, cw)
-    print(f"Time for closest_game_match: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
-    
-    start_time = datetime.datetime.now()
-    top_scoring_team_Week = espn_helper.highest_scoring_team(league, cw)
-    print(f"Time for top_scoring_team_string: {(datetime.datetime.now() - start_time).total_seconds()} seconds")
-    
-    # Formatting the summary
+    # Formatting the summary; ranking and luck lines share the indentation of the bullets
+    week_rankings = "\n".join(f"    {line}" for line in week_rankings.split("\n"))
+    luck_bullets = "".join(f"\n    - {line}" for line in luck_lines)
     summary = f"""
-    - Top scoring fantasy team this week: {top_scoring_team_Week} 
+    - Top scoring fantasy team this week: {top_scoring_team_week.name} ({top_scoring_team_week.points}) 
     - Top 3 fantasy teams: {espn_helper.clean_team_name(top_teams[0].team_name)}, {espn_helper.clean_team_name(top_teams[1].team_name)}, {espn_helper.clean_team_name(top_teams[2].team_name)}
-    - Top scoring NFL player of the week: {top_scorer_week[0].name} with {top_scorer_week[1]} points.
-    - Worst scoring NFL player of the week: {worst_scorer_week[0].name} with {worst_scorer_week[1]} points.
-    - Top scoring NFL player of the season: {top_scorer_szn[0].name} with {top_scorer_szn[1]} points.
-    - Worst scoring NFL player of the season: {worst_scorer_szn[0].name} with {worst_scorer_szn[1]} points.
+    - Top scoring NFL player of the week: {top_scorer_week[0].name} with {top_scorer_week[0].points} points.
+    - Worst scoring NFL player of the week: {worst_scorer_week[0].name} with {worst_scorer_week[0].points} points.
+    - Top scoring NFL player of the season: {top_scorer_szn[0]} with {round(top_scorer_szn[1], 2)} points.
+    - Worst scoring NFL player of the season: {worst_scorer_szn[0]} with {round(worst_scorer_szn[1], 2)} points.
     - Fantasy Team with the most transactions: {espn_helper.clean_team_name(most_trans[0].team_name)} ({most_trans[1]} transactions)
     - Fantasy Team with the most injured players: {espn_helper.clean_team_name(most_injured[0].team_name)} ({most_injured[1]} players: {', '.join(most_injured[2])})
-    - Highest scoring benched player: {highest_bench[0].name} with {highest_bench[0].points} points (Rostered by {espn_helper.clean_team_name(highest_bench[1].team_name)})
-    - Lowest scoring starting player of the week: {lowest_start[0].name} with {lowest_start[0].points} points (Rostered by {espn_helper.clean_team_name(lowest_start[1].team_name)})
-    - Biggest blowout match of the week: {espn_helper.clean_team_name(biggest_blowout.home_team.team_name)} ({biggest_blowout.home_score} points) vs {espn_helper.clean_team_name(biggest_blowout.away_team.team_name)} ({biggest_blowout.away_score} points)
-    - Closest game of the week: {espn_helper.clean_team_name(closest_game.home_team.team_name)} ({closest_game.home_score} points) vs {espn_helper.clean_team_name(closest_game.away_team.team_name)} ({closest_game.away_score} points)
+    - Highest scoring benched player: {highest_bench[0].name} with {highest_bench[0].points} points (Rostered by {espn_helper.clean_team_name(highest_bench[1].name)})
+    - Lowest scoring starting player of the week: {lowest_start[0].name} with {lowest_start[0].points} points (Rostered by {espn_helper.clean_team_name(lowest_start[1].name)})
+    - Biggest blowout match of the week: {espn_helper.clean_team_name(biggest_blowout[0].name)} ({biggest_blowout[0].points} points) vs {espn_helper.clean_team_name(biggest_blowout[1].name)} ({biggest_blowout[1].points} points)
+    - Closest game of the week: {espn_helper.clean_team_name(closest_game[0].name)} ({closest_game[0].points} points) vs {espn_helper.clean_team_name(closest_game[1].name)} ({closest_game[1].points} points)
+    - Power rankings (all-play record this week):
+{week_rankings}{luck_bullets}
     """
     
     return summary.strip()
 
-@st.cache_data(ttl=3600)
 def get_espn_league_summary(league_id, espn2, SWID):
     # Fetch data from ESPN Fantasy API and compute statistics   
     start_time_league_connect = datetime.datetime.now() 
@@ -212,16 +372,25 @@ def get_espn_league_summary(league_id, espn2, SWID):
     end_time_league_connect = datetime.datetime.now()
     league_connect_duration = (end_time_league_connect - start_time_league_connect).total_seconds()
     cw = league.current_week-1
+    # Cached weeks are served without further ESPN calls; the League call above still
+    # validates the credentials and tells us which week that is
+    cached_summary = lookup_week_summary("espn", league_id, year, cw)
+    if cached_summary is not None:
+        debug_info = "Summary: " + cached_summary + " ~~~Timings~~~ " + f"League Connect Duration: {league_connect_duration} seconds " + "Served from summary cache"
+        return cached_summary, debug_info
+    # Deduplicate upstream ESPN calls made by the helpers for this recap
+    league = espn_helper.CachedLeague(league)
     # Generate summary
     start_time_summary = datetime.datetime.now()
     summary = generate_espn_summary(league, cw)
     end_time_summary = datetime.datetime.now()
     summary_duration = (end_time_summary - start_time_summary).total_seconds()
+    store_week_summary("espn", league_id, year, cw, summary, immutable=helper.is_week_final(cw, league.current_week),
+                       league_week=espn_helper.fetch_league_week(league, cw))
     # Generage debugging information, placeholder for now
-    debug_info = "Summary: " + summary + " ~~~Timings~~~ " + f"League Connect Duration: {league_connect_duration} seconds " + f"Summary Duration: {summary_duration} seconds "
+    debug_info = "Summary: " + summary + " ~~~Timings~~~ " + f"League Connect Duration: {league_connect_duration} seconds " + f"Summary Duration: {summary_duration} seconds " + f"~~~ESPN Calls~~~ {league.cache_stats()}"
     return summary, debug_info
 
-@st.cache_data(ttl=3600)
 def get_yahoo_league_summary(league_id, auth_path):    
     league_id = league_id
     LOGGER.info(f"League id: {league_id}")
@@ -232,10 +401,85 @@ def get_yahoo_league_summary(league_id, auth_path):
         game_code="nfl"
     )
     LOGGER.info(f"sc: {sc}")
-    mrw = yahoo_helper.get_most_recent_week(sc)
-    recap = yahoo_helper.generate_weekly_recap(sc, week=mrw)
+    league = yahoo_helper.get_league_overview(sc)
+    mrw = yahoo_helper.get_most_recent_week(sc, league)
+    # Cached weeks are served after the overview request has validated access
+    recap = lookup_week_summary("yahoo", league_id, league.season, mrw)
+    if recap is not None:
+        return recap
+    league_week = yahoo_helper.fetch_league_week(sc, mrw, league)
+    season = update_season(
+        "yahoo", league_id, league.season, league_week, league.current_week,
+        lambda weeks: fetch_weeks_concurrently(lambda week: yahoo_helper.fetch_league_week(sc, week, league), weeks),
+    )
+    recap = yahoo_helper.generate_weekly_recap(sc, week=mrw, league=league, league_week=league_week, season=season)
+    store_week_summary("yahoo", league_id, league.season, mrw, recap, immutable=helper.is_week_final(mrw, league.current_week), league_week=league_week)
     return recap
 
+def store_season_summary(platform, league_id, year, week, summary):
+    # Season summaries run through the most recently completed week, which stat corrections can still change
+    SUMMARY_CACHE.put(f"{platform}:season_summary", league_id, year, week, summary, ttl=IN_PROGRESS_TTL)
+    get_snapshot_store().put(platform, league_id, year, week, summary, immutable=False, kind="season_summary")
 
+def get_espn_season_summary(league_id, espn2, SWID):
+    """
+    Builds a season in review summary of every completed ESPN week.
+    
+    Returns:
+    - Tuple(str, str): The summary and debug information, like `get_espn_league_summary`.
+    """
+    start_time = datetime.datetime.now()
+    try:
+        league = League(league_id=league_id, year=2023, espn_s2=espn2, swid=SWID)
+    except Exception as e:
+        return str(e), "Error occurred during validation"
+    cw = league.current_week - 1
+    summary = lookup_week_summary("espn", league_id, league.year, cw, kind="season_summary")
+    if summary is not None:
+        return summary, "Served from summary cache"
+    league = espn_helper.CachedLeague(league)
+    league_weeks, season = gather_season(
+        "espn", league_id, league.year, cw,
+        lambda weeks: fetch_weeks_concurrently(lambda week: espn_helper.fetch_league_week(league, week), weeks),
+    )
+    summary = build_season_summary(league_weeks, season)
+    store_season_summary("espn", league_id, league.year, cw, summary)
+    debug_info = f"Season Summary Duration: {(datetime.datetime.now() - start_time).total_seconds()} seconds ~~~ESPN Calls~~~ {league.cache_stats()}"
+    return summary, debug_info
 
+def get_yahoo_season_summary(league_id, auth_path):
+    """
+    Builds a season in review summary of every completed Yahoo week.
+    """
+    sc = YahooFantasySportsQuery(
+        auth_dir=auth_path,
+        league_id=league_id,
+        game_code="nfl"
+    )
+    league = yahoo_helper.get_league_overview(sc)
+    mrw = yahoo_helper.get_most_recent_week(sc, league)
+    summary = lookup_week_summary("yahoo", league_id, league.season, mrw, kind="season_summary")
+    if summary is not None:
+        return summary
+    league_weeks, season = gather_season(
+        "yahoo", league_id, league.season, mrw,
+        lambda weeks: fetch_weeks_concurrently(lambda week: yahoo_helper.fetch_league_week(sc, week, league), weeks),
+    )
+    summary = build_season_summary(league_weeks, season)
+    store_season_summary("yahoo", league_id, league.season, mrw, summary)
+    return summary
 
+def generate_sleeper_season_summary(league_id):
+    """
+    Builds a season in review summary of every completed Sleeper week.
+    """
+    today = datetime.datetime.now()
+    week = helper.get_current_week(today) - 1
+    year = helper.get_nfl_season(today)
+    summary = lookup_week_summary("sleeper", league_id, year, week, kind="season_summary")
+    if summary is not None:
+        return summary
+    league_weeks, season = gather_season("sleeper", league_id, year, week, sleeper_week_fetcher(league_id, week))
+    summary = build_season_summary(league_weeks, season)
+    store_season_summary("sleeper", league_id, year, week, summary)
+    return summary
@@ -0,0 +1,213 @@
+# Normalized lineup slots; every other slot is a starting position
+BENCH = "BE"
+INJURED_RESERVE = "IR"
+
+_SLOT_ALIASES = {"BN": BENCH, "BE": BENCH, "IR": INJURED_RESERVE, "IL": INJURED_RESERVE}
+
+# Normalized injury designations
+_INJURY_CODES = {
+    "O": "O", "OUT": "O",
+    "Q": "Q", "QUESTIONABLE": "Q",
+    "D": "D", "DOUBTFUL": "D",
+    "IR": "IR", "INJURY_RESERVE": "IR",
+    "PUP": "PUP", "PUP-P": "PUP", "PUP-R": "PUP",
+    "SUS": "SUSP", "SUSP": "SUSP", "SUSPENSION": "SUSP",
+    "NA": "NA", "NFI-R": "NA", "NFI-A": "NA",
+}
+_HEALTHY = {"", "ACTIVE", "NORMAL", "NONE", "HEALTHY"}
+
+
+def normalize_slot(slot):
+    return _SLOT_ALIASES.get(slot, slot)
+
+
+def normalize_injury_status(status):
+    """
+    Maps a platform injury designation ('QUESTIONABLE', 'Q', 'Questionable') to one code.
+
+    Returns:
+    - str: 'O', 'Q', 'D', 'IR', 'PUP', 'SUSP', 'NA' or another upper-cased designation,
+      None for healthy players.
+    """
+    if status is None:
+        return None
+    status = str(status).strip().upper()
+    if status in _HEALTHY:
+        return None
+    return _INJURY_CODES.get(status, status)
+
+
+class _Record:
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.__slots__, args), **kwargs)
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __reduce__(self):
+        # Pickle as a plain tuple of values instead of a per-object dict of slot names
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if name not in ("players", "teams"))
+        return f"{self.__class__.__name__}({fields})"
+
+
+class PlayerWeek(_Record):
+    """
+    One rostered player's week: lineup slot, points, projection and injury status.
+    """
+
+    __slots__ = ("player_id", "name", "position", "slot", "points", "projected", "injury_status")
+
+    @property
+    def starter(self):
+        return self.slot not in (BENCH, INJURED_RESERVE)
+
+
+class TeamWeek(_Record):
+    """
+    One fantasy team's week. `matchup_id` pairs the team with its opponent.
+    """
+
+    __slots__ = ("team_id", "name", "points", "projected", "matchup_id", "players")
+
+
+class LeagueWeek(_Record):
+    """
+    Every team of a league for one week.
+
+    Built by the platform adapters below, so weekly stats are written once against
+    these records (see `utils.week_stats`) instead of once per platform.
+    """
+
+    __slots__ = ("platform", "league_id", "week", "teams")
+
+    def players(self):
+        """
+        Yields (PlayerWeek, TeamWeek) for every rostered player, in team order.
+        """
+        for team in self.teams:
+            for player in team.players:
+                yield player, team
+
+    def matchups(self):
+        """
+        Returns the head-to-head pairs of the week as (TeamWeek, TeamWeek), in order of first
+        appearance. Byes and multi-team groupings are left out.
+        """
+        groups = {}
+        for team in self.teams:
+            if team.matchup_id is not None:
+                groups.setdefault(team.matchup_id, []).append(team)
+        return [tuple(teams) for teams in groups.values() if len(teams) == 2]
+
+
+# Adapters
+
+def league_week_from_espn(box_scores, league_id, week):
+    """
+    Builds a LeagueWeek from espn_api box scores.
+
+    Args:
+    - box_scores (List[BoxScore]): Box scores for the week.
+    - league_id: The league id.
+    - week (int): The week number.
+
+    Returns:
+    - LeagueWeek: The normalized week.
+    """
+    teams = []
+    for matchup_id, box_score in enumerate(box_scores):
+        sides = (
+            (box_score.home_team, box_score.home_score, getattr(box_score, "home_projected", None), box_score.home_lineup),
+            (box_score.away_team, box_score.away_score, getattr(box_score, "away_projected", None), box_score.away_lineup),
+        )
+        for team, score, projected, lineup in sides:
+            # espn_api uses 0 for the missing side of a bye
+            if not team:
+                continue
+            players = [
+                PlayerWeek(
+                    player.playerId, player.name, player.position, normalize_slot(player.slot_position),
+                    player.points, player.projected_points, normalize_injury_status(getattr(player, "injuryStatus", None)),
+                )
+                for player in lineup
+            ]
+            teams.append(TeamWeek(team.team_id, team.team_name, score, projected, matchup_id, players))
+    return LeagueWeek("espn", league_id, week, teams)
+
+
+def _decode(name):
+    return name.decode("utf-8") if isinstance(name, bytes) else name
+
+
+def league_week_from_yahoo(team_ids, team_rosters, matchups, league_id, week):
+    """
+    Builds a LeagueWeek from yfpy rosters and matchups.
+
+    Args:
+    - team_ids (dict): Team ids to team names, in league order.
+    - team_rosters (dict): Team ids to their weekly roster players.
+    - matchups (List[Matchup]): The week's matchups from `get_league_matchups_by_week`.
+    - league_id: The league id.
+    - week (int): The week number.
+
+    Returns:
+    - LeagueWeek: The normalized week, teams in the order of `team_ids`.
+    """
+    scored = {}
+    for matchup_id, matchup in enumerate(matchups):
+        for team in matchup.teams:
+            scored[str(team.team_id)] = (team.team_points.total, team.team_projected_points.total, matchup_id)
+
+    teams = []
+    for team_id, team_name in team_ids.items():
+        points, projected, matchup_id = scored.get(str(team_id), (None, None, None))
+        players = [
+            PlayerWeek(
+                player.player_id, player.name.full, player.display_position,
+                normalize_slot(player.selected_position.position), player.player_points.total,
+                None, normalize_injury_status(player.status),
+            )
+            for player in team_rosters[team_id]
+        ]
+        teams.append(TeamWeek(team_id, _decode(team_name), points, projected, matchup_id, players))
+    return LeagueWeek("yahoo", league_id, week, teams)
+
+
+def league_week_from_sleeper(matchups, index, players_data, league_id, week):
+    """
+    Builds a LeagueWeek from Sleeper matchups.
+
+    Sleeper matchups only say which players started, so starters get their position as
+    slot and everyone else is on the bench.
+
+    Args:
+    - matchups (List[dict]): The week's matchups.
+    - index (LeagueIndex): Lookups for the league's rosters and users.
+    - players_data: Players by id (dict or PlayerStore).
+    - league_id: The league id.
+    - week (int): The week number.
+
+    Returns:
+    - LeagueWeek: The normalized week.
+    """
+    teams = []
+    for matchup in matchups:
+        roster_id = matchup.get('roster_id')
+        starters = set(matchup.get('starters') or [])
+        players = []
+        for player_id, score in (matchup.get('players_points') or {}).items():
+            player = players_data.get(player_id)
+            name = player.get('full_name', 'Unknown Player') if player is not None else None
+            position = player.get('position') if player is not None else None
+            injury_status = player.get('injury_status') if player is not None else None
+            slot = position if player_id in starters else BENCH
+            players.append(PlayerWeek(player_id, name, position, slot, score, None, normalize_injury_status(injury_status)))
+        teams.append(TeamWeek(
+            roster_id, index.team_name_for_roster(roster_id), matchup.get('points', 0),
+            None, matchup.get('matchup_id'), players,
+        ))
+    return LeagueWeek("sleeper", league_id, week, teams)
@@ -0,0 +1,118 @@
+import numpy as np
+from utils.week_model import BENCH, INJURED_RESERVE
+
+# Injury designations that count a player as banged up
+BANGED_UP_STATUSES = ("IR", "PUP", "O", "Q")
+
+
+class WeekArrays:
+    """
+    Columnar view of a LeagueWeek for vectorized stats.
+
+    Player columns (`points`, `projected`, `team_index`, `starter`, `injured_reserve`,
+    `banged_up`) hold one entry per rostered player in league order; team columns
+    (`team_points`, `team_projected`) one entry per team, and `pairs` holds the team
+    indices of each head-to-head matchup.
+
+    Args:
+    - league_week (LeagueWeek): The normalized week.
+    """
+
+    __slots__ = (
+        "teams", "players", "points", "projected", "team_index", "starter", "injured_reserve", "banged_up",
+        "team_points", "team_projected", "pairs",
+    )
+
+    def __init__(self, league_week):
+        self.teams = list(league_week.teams)
+        self.players = [player for team in self.teams for player in team.players]
+        # None becomes NaN so missing values drop out of every reduction
+        self.points = np.array([player.points for player in self.players], dtype=float)
+        self.projected = np.array([player.projected for player in self.players], dtype=float)
+        slots = np.array([player.slot for player in self.players], dtype=object)
+        self.injured_reserve = slots == INJURED_RESERVE
+        self.starter = ~(self.injured_reserve | (slots == BENCH))
+        self.banged_up = np.isin(
+            np.array([player.injury_status for player in self.players], dtype=object), BANGED_UP_STATUSES
+        )
+        self.team_index = np.repeat(np.arange(len(self.teams)), [len(team.players) for team in self.teams])
+        team_columns = np.array([(team.points, team.projected) for team in self.teams], dtype=float).reshape(-1, 2)
+        self.team_points, self.team_projected = team_columns[:, 0], team_columns[:, 1]
+        position = {id(team): i for i, team in enumerate(self.teams)}
+        self.pairs = np.array(
+            [(position[id(first)], position[id(second)]) for first, second in league_week.matchups()], dtype=np.intp
+        ).reshape(-1, 2)
+
+
+def _argmax(values, mask):
+    # First index of the largest masked value (ties go to league order), None if nothing qualifies
+    if not mask.any():
+        return None
+    return int(np.argmax(np.where(mask, values, -np.inf)))
+
+
+def _argmin(values, mask):
+    if not mask.any():
+        return None
+    return int(np.argmin(np.where(mask, values, np.inf)))
+
+
+def compute_week_stats(league_week):
+    """
+    Computes every weekly player, team and matchup extreme of a LeagueWeek.
+
+    The week is turned into columnar arrays once (see `WeekArrays`) and each stat is a
+    masked vectorized reduction over them. Ties go to the first player or team in
+    league order.
+
+    Args:
+    - league_week (LeagueWeek): The normalized week, or its already built WeekArrays.
+
+    Returns:
+    - dict: Weekly stats keyed by name, each None when nothing qualifies:
+      - 'top_scorer', 'worst_scorer' (ignoring the IR slot), 'highest_benched',
+        'lowest_starter': Tuple(PlayerWeek, TeamWeek).
+      - 'highest_scoring_team': TeamWeek.
+      - 'biggest_blowout', 'closest_game': Tuple(TeamWeek, TeamWeek, float) with the
+        winner first and the point differential.
+      - 'biggest_bust': Tuple(TeamWeek, float), the team furthest below its projection.
+      - 'most_banged_up': Tuple(TeamWeek, int), the team with the most injured players.
+    """
+    week = league_week if isinstance(league_week, WeekArrays) else WeekArrays(league_week)
+
+    def player(i):
+        return None if i is None else (week.players[i], week.teams[week.team_index[i]])
+
+    scored = ~np.isnan(week.points)
+    bench = ~week.starter & ~week.injured_reserve
+    stats = {
+        "top_scorer": player(_argmax(week.points, scored)),
+        "worst_scorer": player(_argmin(week.points, scored & ~week.injured_reserve)),
+        "highest_benched": player(_argmax(week.points, scored & bench)),
+        "lowest_starter": player(_argmin(week.points, scored & week.starter)),
+    }
+
+    top_team = _argmax(week.team_points, ~np.isnan(week.team_points))
+    stats["highest_scoring_team"] = None if top_team is None else week.teams[top_team]
+
+    busts = week.team_projected - week.team_points
+    with np.errstate(invalid="ignore"):
+        bust = _argmax(busts, busts > 0)
+    stats["biggest_bust"] = None if bust is None else (week.teams[bust], float(busts[bust]))
+
+    banged_up = np.bincount(week.team_index, weights=week.banged_up, minlength=len(week.teams))
+    most_banged_up = _argmax(banged_up, banged_up > 0)
+    stats["most_banged_up"] = None if most_banged_up is None else (week.teams[most_banged_up], int(banged_up[most_banged_up]))
+
+    first, second = week.team_points[week.pairs[:, 0]], week.team_points[week.pairs[:, 1]]
+    margins = np.abs(first - second)
+    winners = np.where(first >= second, week.pairs[:, 0], week.pairs[:, 1])
+    losers = np.where(first >= second, week.pairs[:, 1], week.pairs[:, 0])
+    decided = ~np.isnan(margins)
+
+    def matchup(i):
+        return None if i is None else (week.teams[winners[i]], week.teams[losers[i]], float(margins[i]))
+
+    stats["biggest_blowout"] = matchup(_argmax(margins, decided))
+    stats["closest_game"] = matchup(_argmin(margins, decided))
+    return stats
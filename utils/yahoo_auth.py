@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import threading
+import time
+import requests
+from requests.auth import HTTPBasicAuth
+from streamlit.logger import get_logger
+
+LOGGER = get_logger(__name__)
+
+YAHOO_TOKEN_URL = "https://api.login.yahoo.com/oauth2/get_token"
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TOKEN_DIR = os.environ.get("COMMISH_YAHOO_TOKEN_DIR", os.path.join(ROOT_DIR, ".cache", "yahoo_tokens"))
+# Refresh a little before Yahoo's one hour expiry
+EXPIRY_MARGIN = 60
+# Seconds a sign-in lasts before its tokens are deleted. The session key in the URL is a
+# bearer credential for the stored refresh token: anyone holding a shared link or the
+# browser history can use the Yahoo sign-in until it expires, so keep this short
+SESSION_TTL = int(os.environ.get("COMMISH_YAHOO_SESSION_TTL", 7 * 24 * 3600))
+
+
+def new_user_key():
+    # Opaque key handed to the browser; the tokens themselves never leave the server
+    return secrets.token_urlsafe(32)
+
+
+def _request_token(cid, cse, data):
+    r = requests.post(YAHOO_TOKEN_URL, data=data, auth=HTTPBasicAuth(cid, cse), timeout=10)
+    r.raise_for_status()  # Will raise an exception for HTTP errors
+    token_data = r.json()
+    token_data["token_time"] = time.time()
+    return token_data
+
+
+def exchange_code(cid, cse, code, redirect_uri="oob"):
+    """
+    Exchanges an OAuth authorization code for access and refresh tokens.
+    """
+    return _request_token(cid, cse, {"redirect_uri": redirect_uri, "code": code, "grant_type": "authorization_code"})
+
+
+def refresh_access_token(cid, cse, refresh_token, redirect_uri="oob"):
+    """
+    Gets a new access token with a stored refresh token.
+    """
+    token_data = _request_token(
+        cid, cse, {"redirect_uri": redirect_uri, "refresh_token": refresh_token, "grant_type": "refresh_token"}
+    )
+    # Yahoo may omit the refresh token when it did not rotate it
+    token_data.setdefault("refresh_token", refresh_token)
+    return token_data
+
+
+class TokenStore:
+    """
+    On-disk Yahoo OAuth token store keyed by user.
+
+    Each user gets a stable directory holding the yfpy `token.json` and `private.json`
+    files, so repeat sessions skip the code exchange and expired access tokens are
+    refreshed with the stored refresh token. A sign-in expires `session_ttl` seconds
+    after the code exchange, however often it is refreshed; expired directories are
+    deleted when read and whenever a new sign-in is created.
+
+    Args:
+    - directory (str): Root directory for the per-user token directories.
+    - session_ttl (int): Lifetime of a sign-in in seconds.
+    """
+
+    def __init__(self, directory=DEFAULT_TOKEN_DIR, session_ttl=SESSION_TTL):
+        self.directory = directory
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+
+    def user_dir(self, user_key):
+        # Hash the key so it cannot be used to traverse the filesystem
+        return os.path.join(self.directory, hashlib.sha256(user_key.encode("utf-8")).hexdigest()[:32])
+
+    def _write_json(self, path, data):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+
+    def _expired(self, user_dir):
+        try:
+            with open(os.path.join(user_dir, "session.json")) as f:
+                created_at = json.load(f)["created_at"]
+        except (OSError, ValueError, KeyError):
+            # Never finished signing in
+            return True
+        return created_at + self.session_ttl <= time.time()
+
+    def load(self, user_key):
+        if not user_key:
+            return None
+        user_dir = self.user_dir(user_key)
+        path = os.path.join(user_dir, "token.json")
+        if not os.path.exists(path):
+            return None
+        if self._expired(user_dir):
+            LOGGER.info("Yahoo sign-in expired, deleting its tokens")
+            shutil.rmtree(user_dir, ignore_errors=True)
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def delete(self, user_key):
+        shutil.rmtree(self.user_dir(user_key), ignore_errors=True)
+
+    def prune(self):
+        """
+        Deletes every expired sign-in.
+
+        Returns:
+        - int: Number of sign-ins deleted.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            user_dir = os.path.join(self.directory, name)
+            if os.path.isdir(user_dir) and self._expired(user_dir):
+                shutil.rmtree(user_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def create(self, token_data, cid, cse):
+        """
+        Stores the tokens of a new sign-in under a new user key.
+
+        Returns:
+        - str: The user key.
+        """
+        user_key = new_user_key()
+        with self._lock:
+            removed = self.prune()
+            if removed:
+                LOGGER.info(f"Deleted {removed} expired Yahoo sign-ins")
+            self.save(user_key, token_data, cid, cse)
+            self._write_json(os.path.join(self.user_dir(user_key), "session.json"), {"created_at": time.time()})
+        return user_key
+
+    def save(self, user_key, token_data, cid, cse):
+        user_dir = self.user_dir(user_key)
+        os.makedirs(user_dir, mode=0o700, exist_ok=True)
+        # Token file with every field yfpy expects
+        self._write_json(os.path.join(user_dir, "token.json"), {
+            "access_token": token_data.get("access_token", ""),
+            "consumer_key": cid,
+            "consumer_secret": cse,
+            "guid": token_data.get("xoauth_yahoo_guid", token_data.get("guid")),
+            "refresh_token": token_data.get("refresh_token", ""),
+            "expires_in": token_data.get("expires_in", 3600),
+            "token_time": token_data.get("token_time", time.time()),
+            "token_type": "bearer",
+        })
+        # Private file with consumer key and secret
+        self._write_json(os.path.join(user_dir, "private.json"), {"consumer_key": cid, "consumer_secret": cse})
+        return user_dir
+
+    def auth_dir(self, user_key, cid, cse):
+        """
+        Returns the user's yfpy auth directory, refreshing the access token if it expired.
+
+        A refresh token Yahoo rejects (revoked or expired) is deleted, like an expired
+        sign-in, so the user goes through the authorization code exchange again.
+
+        Returns:
+        - str: The auth directory, or None if the user has no usable token.
+        """
+        with self._lock:
+            token = self.load(user_key)
+            if token is None:
+                return None
+            if token["token_time"] + token["expires_in"] - EXPIRY_MARGIN <= time.time():
+                try:
+                    token = refresh_access_token(cid, cse, token["refresh_token"])
+                except requests.exceptions.HTTPError as err:
+                    # 4xx means the refresh token itself is no good; anything else may be transient
+                    if err.response is None or not 400 <= err.response.status_code < 500:
+                        raise
+                    LOGGER.warning(f"Yahoo rejected the stored refresh token, signing the user out: {err}")
+                    self.delete(user_key)
+                    return None
+                self.save(user_key, token, cid, cse)
+            return self.user_dir(user_key)
+
+
+TOKEN_STORE = TokenStore()
@@ -1,19 +1,72 @@
 from yfpy.query import YahooFantasySportsQuery
+from yfpy.models import League
 from streamlit.logger import get_logger
+from concurrent.futures import ThreadPoolExecutor
+from utils.week_model import league_week_from_yahoo
+from utils.week_stats import compute_week_stats
+from utils.power_rankings import format_luck, format_power_rankings, power_rankings, week_scores_from_league_week
+import time
 LOGGER = get_logger(__name__)
 
-def get_most_recent_week(sc):
+# Default cap on concurrent Yahoo roster requests
+ROSTER_FETCH_WORKERS = 8
+# Number of teams requested per league collection roster query
+ROSTER_BATCH_SIZE = 16
+
+YAHOO_FANTASY_URL = "https://fantasysports.yahooapis.com/fantasy/v2"
+
+def get_league_key(sc):
+    """
+    Resolves the league key once and pins it on the query object.
+    
+    yfpy looks up the current game key with an extra request every time the league key
+    is needed unless it has been set, so pinning it saves a round-trip per query.
+    
+    Parameters:
+    - sc (object): The YahooFantasySportsQuery object.
+    
+    Returns:
+    - str: The league key, e.g. "423.l.123456".
+    """
+    if not sc.league_key:
+        sc.league_key = sc.get_league_key()
+    return sc.league_key
+
+def get_league_overview(sc):
+    """
+    Retrieves the league metadata, teams and standings with a single league resource request.
+    
+    Parameters:
+    - sc (object): The YahooFantasySportsQuery object.
+    
+    Returns:
+    - League: A yfpy League with `current_week`, `teams` and `standings` populated.
+    """
+    try:
+        league_key = get_league_key(sc)
+        return sc.query(
+            f"{YAHOO_FANTASY_URL}/league/{league_key};out=standings,teams",
+            ["league"],
+            League
+        )
+    except Exception as e:
+        LOGGER.exception("Failed to get the league overview")
+        raise e  # Reraise the exception after logging it
+
+
+def get_most_recent_week(sc, league=None):
     """
     Retrieves the most recently completed week in the fantasy league.
     
     Parameters:
     - sc (object): The YahooFantasySportsQuery object.
+    - league (League): Already fetched league overview, fetched if not given.
     
     Returns:
     - int: The most recently completed week.
     """
     try:
-        league_info = sc.get_league_info()
+        league_info = league or sc.get_league_info()
         completed_week = league_info.current_week - 1
         LOGGER.info(f"Most recent week retrieved successfully: {completed_week}")
         return completed_week
@@ -39,64 +92,65 @@ def extract_team_ids(teams):
         raise e  # Reraise the exception after logging it
 
 
-def find_extreme_scorers_and_banged_up_team(sc, team_ids, week=3):
+def fetch_team_rosters(sc, team_ids, week, max_workers=ROSTER_FETCH_WORKERS):
+    """
+    Fetches the weekly roster player stats of every team concurrently.
+    
+    Parameters:
+    - sc (object): The YahooFantasySportsQuery object.
+    - team_ids (dict): A dictionary mapping team ids to team names.
+    - week (int): The week for which to retrieve player stats.
+    - max_workers (int): Maximum number of concurrent Yahoo requests.
+    
+    Returns:
+    - dict: A dictionary mapping team ids to their list of players, in the order of `team_ids`.
+    """
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            team_id: executor.submit(sc.get_team_roster_player_stats_by_week, team_id, chosen_week=week)
+            for team_id in team_ids
+        }
+        team_rosters = {team_id: future.result() for team_id, future in futures.items()}
+    LOGGER.info(f"Fetched {len(team_rosters)} team rosters in {time.perf_counter() - start_time:.2f} seconds (max_workers={max_workers})")
+    return team_rosters
+
+
+def fetch_team_rosters_batched(sc, team_ids, week, batch_size=ROSTER_BATCH_SIZE):
     """
-    Finds the highest and lowest scoring players of the week, 
-    highest-scoring player on the bench, lowest-scoring player that started,
-    and the team with the most 'banged up' players.
+    Fetches the weekly roster player stats of every team with league collection queries.
+    
+    Yahoo returns the rosters of several teams in a single `teams;team_keys=.../roster`
+    collection request, so a league needs one request per `batch_size` teams instead
+    of one per team.
     
     Parameters:
     - sc (object): The YahooFantasySportsQuery object.
     - team_ids (dict): A dictionary mapping team ids to team names.
     - week (int): The week for which to retrieve player stats.
+    - batch_size (int): Maximum number of teams per request.
     
     Returns:
-    - tuple: A tuple containing the highest and lowest scoring players,
-             highest-scoring player on the bench, lowest-scoring player that started,
-             and the team with the most 'banged up' players.
-    """
-    highest_scorer = None
-    lowest_scorer = None
-    highest_scorer_bench = None
-    lowest_scorer_started = None
-    most_banged_up_team = None
-    most_banged_up_count = 0
-    
-    for team_id, team_name in team_ids.items():
-        # Get player stats for the team
-        players_stats = sc.get_team_roster_player_stats_by_week(team_id, chosen_week=week)
-        
-        banged_up_count = 0  # Counter for the number of 'banged up' players in the current team
-        
-        for player in players_stats:
-            # Check if this player has the highest score so far
-            if (highest_scorer is None) or (player.player_points.total > highest_scorer[0].player_points.total):
-                highest_scorer = (player, team_name)
-            
-            # Check if this player has the lowest score so far
-            if (lowest_scorer is None) or (player.player_points.total < lowest_scorer[0].player_points.total):
-                lowest_scorer = (player, team_name)
-            
-            # Check if this player is on the bench and has the highest score among benched players
-            if player.selected_position.position == "BN" and \
-               (highest_scorer_bench is None or player.player_points.total > highest_scorer_bench[0].player_points.total):
-                highest_scorer_bench = (player, team_name)
-            
-            # Check if this player is started and has the lowest score among started players
-            if player.selected_position.position != "BN" and \
-               (lowest_scorer_started is None or player.player_points.total < lowest_scorer_started[0].player_points.total):
-                lowest_scorer_started = (player, team_name)
-            
-            # Check if this player is 'banged up'
-            if player.status in ["IR", "PUP", "O", "Q"]:
-                banged_up_count += 1
-        
-        # Check if this team has the most 'banged up' players so far
-        if banged_up_count > most_banged_up_count:
-            most_banged_up_count = banged_up_count
-            most_banged_up_team = (team_name, banged_up_count)
-    
-    return highest_scorer, lowest_scorer, highest_scorer_bench, lowest_scorer_started, most_banged_up_team
+    - dict: A dictionary mapping team ids to their list of players, in the order of `team_ids`.
+    """
+    start_time = time.perf_counter()
+    league_key = get_league_key(sc)
+    ids = list(team_ids)
+    fetched = {}
+    for i in range(0, len(ids), batch_size):
+        team_keys = ",".join(f"{league_key}.t.{team_id}" for team_id in ids[i:i + batch_size])
+        teams = sc.query(
+            f"{YAHOO_FANTASY_URL}/teams;team_keys={team_keys}/roster;week={week}/players/stats",
+            ["teams"]
+        )
+        # yfpy unwraps single item collections
+        if not isinstance(teams, list):
+            teams = [teams.get("team") if isinstance(teams, dict) else teams]
+        for team in teams:
+            fetched[int(team.team_id)] = team.players
+    LOGGER.info(f"Fetched {len(fetched)} team rosters in {time.perf_counter() - start_time:.2f} seconds with batched queries")
+    return {team_id: fetched[int(team_id)] for team_id in ids}
+
 
 def team_with_most_moves(teams):
     """
@@ -122,115 +176,84 @@ def team_with_most_moves(teams):
     # Return a message with the team name and number of moves
     return f"The team with the greatest number of moves/transactions is {team_name.decode('utf-8')} with {most_moves} moves!"
 
-def analyze_weekly_performance(sc, chosen_week):
+def fetch_league_week(sc, week, league=None):
     """
-    Analyzes the weekly performance of teams and matches in the league.
+    Fetches every team's roster and the matchups of a week as a provider-agnostic LeagueWeek.
     
     Parameters:
     - sc (object): The YahooFantasySportsQuery object.
-    - chosen_week (int): The week for which to retrieve and analyze data.
+    - week (int): The week to fetch.
+    - league (League): League overview from `get_league_overview`, fetched if not given.
     
     Returns:
-    - dict: A dictionary containing the analysis results.
+    - LeagueWeek: The normalized week.
     """
-    matchups = sc.get_league_matchups_by_week(chosen_week)
-    
-    highest_scoring_team = None
-    biggest_blowout = {"teams": None, "point_diff": 0}
-    closest_match = {"teams": None, "point_diff": float('inf')}
-    biggest_bust = {"team": None, "point_diff": 0}
-    
-    for matchup in matchups:
-        teams = matchup.teams
-        
-        # 1. Find the highest-scoring team of the week
-        for team in teams:
-            if (highest_scoring_team is None) or (team.team_points.total > highest_scoring_team.team_points.total):
-                highest_scoring_team = team
-        
-        # 2. Find the biggest blowout match of the week
-        point_diff = round(abs(teams[0].team_points.total - teams[1].team_points.total), 2)
-        if point_diff > biggest_blowout["point_diff"]:
-            biggest_blowout = {"teams": teams, "point_diff": point_diff}
-        
-        # 3. Find the closest match of the week
-        if point_diff < closest_match["point_diff"]:
-            closest_match = {"teams": teams, "point_diff": point_diff}
-        
-        # 4. Find the biggest bust of the week
-        for team in teams:
-            projected_diff = round(team.team_projected_points.total - team.team_points.total, 2)
-            if projected_diff > biggest_bust["point_diff"]:
-                biggest_bust = {"team": team, "point_diff": projected_diff}
-
-    
-    # Creating a result dictionary
-    result = {
-        "highest_scoring_team": {
-            "name": highest_scoring_team.name.decode('utf-8'),
-            "score": highest_scoring_team.team_points.total
-        },
-        "biggest_blowout": {
-            "team_1_name": biggest_blowout["teams"][0].name.decode('utf-8'),
-            "team_1_score": biggest_blowout["teams"][0].team_points.total,
-            "team_2_name": biggest_blowout["teams"][1].name.decode('utf-8'),
-            "team_2_score": biggest_blowout["teams"][1].team_points.total,
-            "point_diff": biggest_blowout["point_diff"]
-        },
-        "closest_match": {
-            "team_1_name": closest_match["teams"][0].name.decode('utf-8'),
-            "team_1_score": closest_match["teams"][0].team_points.total,
-            "team_2_name": closest_match["teams"][1].name.decode('utf-8'),
-            "team_2_score": closest_match["teams"][1].team_points.total,
-            "point_diff": closest_match["point_diff"]
-        },
-        "biggest_bust": {
-            "name": biggest_bust["team"].name.decode('utf-8'),
-            "point_diff": biggest_bust["point_diff"]
-        }
-    }
-
-    
-    return result
+    if league is None:
+        league = get_league_overview(sc)
+    team_ids = extract_team_ids(league.teams)
+    try:
+        team_rosters = fetch_team_rosters_batched(sc, team_ids, week)
+    except Exception:
+        LOGGER.exception("Batched roster query failed, falling back to per-team requests")
+        team_rosters = fetch_team_rosters(sc, team_ids, week)
+    matchups = sc.get_league_matchups_by_week(week)
+    return league_week_from_yahoo(team_ids, team_rosters, matchups, sc.league_id, week)
 
 
-def generate_weekly_recap(sc, week):
+def generate_weekly_recap(sc, week, league=None, league_week=None, season=None):
     """
     Generates a weekly recap string for the fantasy league.
     
     Parameters:
     - sc (object): The YahooFantasySportsQuery object.
     - week (int): The week for which to generate the recap.
+    - league (League): League overview from `get_league_overview`, fetched if not given.
+    - league_week (LeagueWeek): Already fetched week from `fetch_league_week`, fetched if not given.
+    - season (SeasonAccumulator): Season totals through `week`, adds the luck index when given.
     
     Returns:
     - str: A string containing the weekly recap.
     """
     # Get relevant data
-    teams = sc.get_league_teams()
-    team_ids = extract_team_ids(teams)
-    highest_scorer, lowest_scorer, highest_scorer_bench, lowest_scorer_started, most_banged_up_team = find_extreme_scorers_and_banged_up_team(sc, team_ids, week)
-    analysis_result = analyze_weekly_performance(sc, week)
+    if league is None:
+        league = get_league_overview(sc)
+    if league_week is None:
+        league_week = fetch_league_week(sc, week, league)
+    stats = compute_week_stats(league_week)
+    top_team = stats["highest_scoring_team"]
+    highest_scorer, lowest_scorer = stats["top_scorer"], stats["worst_scorer"]
+    highest_scorer_bench, lowest_scorer_started = stats["highest_benched"], stats["lowest_starter"]
+    closest_match, biggest_blowout = stats["closest_game"], stats["biggest_blowout"]
     
     # Generate the recap string
-    recap = (
-        f"Highest Scoring Team: {analysis_result['highest_scoring_team']['name']} with {analysis_result['highest_scoring_team']['score']} points\n"
-        f"Current Standings: {get_top_teams_string(sc)}\n"
-        f"Highest Scoring Player: {highest_scorer[0].name.full} (rostered by: {highest_scorer[1].decode('utf-8')}) with {highest_scorer[0].player_points.total} points\n"
-        f"Lowest Scoring Player: {lowest_scorer[0].name.full} (rostered by: {lowest_scorer[1].decode('utf-8')}) with {lowest_scorer[0].player_points.total} points\n"
-        f"Highest Scoring Player on Bench: {highest_scorer_bench[0].name.full} (rostered by: {highest_scorer_bench[1].decode('utf-8')}) with {highest_scorer_bench[0].player_points.total} points\n"
-        f"Lowest Scoring Player that Started: {lowest_scorer_started[0].name.full} (rostered by: {lowest_scorer_started[1].decode('utf-8')}) with {lowest_scorer_started[0].player_points.total} points\n"
-        f"Most Banged Up Team: {most_banged_up_team[0].decode('utf-8')} with {most_banged_up_team[1]} injured players\n"
-        f"{team_with_most_moves(teams)}\n"
-        f"Closest Match: {analysis_result['closest_match']['team_1_name']} ({analysis_result['closest_match']['team_1_score']} points) vs {analysis_result['closest_match']['team_2_name']} ({analysis_result['closest_match']['team_2_score']} points) with a point differential of {analysis_result['closest_match']['point_diff']}\n"
-        f"Biggest Blowout Match: {analysis_result['biggest_blowout']['team_1_name']} ({analysis_result['biggest_blowout']['team_1_score']} points) vs {analysis_result['biggest_blowout']['team_2_name']} ({analysis_result['biggest_blowout']['team_2_score']} points) with a point differential of {analysis_result['biggest_blowout']['point_diff']}\n"
-        f"Biggest Team Bust: {analysis_result['biggest_bust']['name']} underperformed by {analysis_result['biggest_bust']['point_diff']} points compared to projections"
-    )
-    
-    return recap
+    lines = [
+        f"Highest Scoring Team: {top_team.name} with {top_team.points} points",
+        f"Current Standings: {get_top_teams_string(sc, league.standings)}",
+        f"Highest Scoring Player: {highest_scorer[0].name} (rostered by: {highest_scorer[1].name}) with {highest_scorer[0].points} points",
+        f"Lowest Scoring Player: {lowest_scorer[0].name} (rostered by: {lowest_scorer[1].name}) with {lowest_scorer[0].points} points",
+    ]
+    if highest_scorer_bench is not None:
+        lines.append(f"Highest Scoring Player on Bench: {highest_scorer_bench[0].name} (rostered by: {highest_scorer_bench[1].name}) with {highest_scorer_bench[0].points} points")
+    lines.append(f"Lowest Scoring Player that Started: {lowest_scorer_started[0].name} (rostered by: {lowest_scorer_started[1].name}) with {lowest_scorer_started[0].points} points")
+    if stats["most_banged_up"] is not None:
+        lines.append(f"Most Banged Up Team: {stats['most_banged_up'][0].name} with {stats['most_banged_up'][1]} injured players")
+    lines.append(team_with_most_moves(league.teams))
+    lines.append(f"Closest Match: {closest_match[0].name} ({closest_match[0].points} points) vs {closest_match[1].name} ({closest_match[1].points} points) with a point differential of {round(closest_match[2], 2)}")
+    lines.append(f"Biggest Blowout Match: {biggest_blowout[0].name} ({biggest_blowout[0].points} points) vs {biggest_blowout[1].name} ({biggest_blowout[1].points} points) with a point differential of {round(biggest_blowout[2], 2)}")
+    if stats["biggest_bust"] is not None:
+        lines.append(f"Biggest Team Bust: {stats['biggest_bust'][0].name} underperformed by {round(stats['biggest_bust'][1], 2)} points compared to projections")
+    # The matchup scores from get_league_matchups_by_week are already in the LeagueWeek
+    week_rankings = power_rankings([week_scores_from_league_week(league_week)])
+    lines.append(f"Power Rankings (all-play record this week):\n{format_power_rankings(week_rankings, weekly=True)}")
+    if season is not None and season.covers(week):
+        lines.extend(format_luck(season.luck()))
+    
+    return "\n".join(lines)
 
 # Helper function to get top teams string
-def get_top_teams_string(sc):
-    standings_data = sc.get_league_standings()
+def get_top_teams_string(sc, standings_data=None):
+    if standings_data is None:
+        standings_data = sc.get_league_standings()
     top_3_teams = sorted(standings_data.teams, key=lambda x: x.team_standings.rank)[:3]
     top_teams_string = ", ".join([f"{team.name.decode('utf-8')} ({ordinal(team.team_standings.rank)} place - {team.team_points.total} points)" for team in top_3_teams])
     return f"{top_teams_string}"